@@ -68,6 +68,14 @@ class MySportsFeeds(object):
 
         self.api_instance.set_auth_credentials(apikey, password)
 
+    # Limit the rate of requests sent to the API
+    def set_rate_limit(self, calls, period=1.0):
+        self.api_instance.set_rate_limit(calls, period)
+
+    # Decode JSON payloads of at least 'threshold' bytes in a process pool
+    def set_parse_pool(self, executor=None, threshold=1024 * 1024, workers=None):
+        self.api_instance.set_parse_pool(executor, threshold, workers)
+
     # Request data (and store it if applicable)
     def msf_get_data(self, **kwargs):
         return self.api_instance.get_data(**kwargs)
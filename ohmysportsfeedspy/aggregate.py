@@ -0,0 +1,232 @@
+import numpy as np
+
+
+# Flatten a v2.x 'stats' block into {'category.statName': value}, keeping numeric values only
+def flatten_stats(stats, prefix=""):
+    flat = {}
+
+    for key, value in stats.items():
+        name = prefix + key
+
+        if isinstance(value, dict):
+            flat.update(flatten_stats(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+
+    return flat
+
+
+# Start time of a gamelog's game in epoch seconds
+def _game_time(gamelog):
+    start = gamelog['game'].get('startTime')
+    if start == None:
+        raise ValueError("Gamelog for game " + str(gamelog['game'].get('id')) + " has no 'startTime'.")
+
+    return np.datetime64(start[:19], 's').astype(np.int64)
+
+
+# Season-to-date accumulators for players or teams, updated incrementally from v2.x daily
+# gamelog feeds ('daily_player_gamelogs' or 'daily_team_gamelogs').  Stats are kept in arrays
+# with one row per player/team and one column per stat: running totals, games played and the
+# latest 'window' games by start time for rolling figures, so feeds may be applied in any order.
+class StatAccumulator(object):
+
+    # Constructor
+    def __init__(self, entity='player', window=5):
+        if entity != 'player' and entity != 'team':
+            raise ValueError("Unrecognized entity '" + entity + "'.  Supported values are: 'player', 'team'")
+
+        self.entity = entity
+        self.window = window
+
+        # Maps of player/team id -> row and stat name -> column
+        self.rows = {}
+        self.columns = {}
+
+        self.totals = np.zeros((0, 0))
+        self.games = np.zeros(0, dtype=np.int64)
+        self.recent = np.zeros((0, window, 0))
+
+        # Start time of the game held in each recent slot (-1 for an empty slot)
+        self.recent_times = np.zeros((0, window), dtype=np.int64)
+
+        # (id, game id) pairs already applied, so re-reading a feed is harmless
+        self.seen = set()
+
+    # Number of players/teams tracked
+    def __len__(self):
+        return len(self.rows)
+
+    # Resize the arrays for new rows and columns, doubling row capacity as needed
+    def __reserve(self, row_count, column_count):
+        capacity, columns = self.totals.shape
+
+        if row_count <= capacity and column_count <= columns:
+            return
+
+        capacity = max(row_count, capacity * 2 if row_count > capacity else capacity)
+        columns = max(column_count, columns)
+
+        totals = np.zeros((capacity, columns))
+        totals[:self.totals.shape[0], :self.totals.shape[1]] = self.totals
+        self.totals = totals
+
+        games = np.zeros(capacity, dtype=np.int64)
+        games[:self.games.shape[0]] = self.games
+        self.games = games
+
+        recent = np.zeros((capacity, self.window, columns))
+        recent[:self.recent.shape[0], :, :self.recent.shape[2]] = self.recent
+        self.recent = recent
+
+        recent_times = np.full((capacity, self.window), -1, dtype=np.int64)
+        recent_times[:self.recent_times.shape[0]] = self.recent_times
+        self.recent_times = recent_times
+
+    # Apply a daily gamelogs response.  Returns the number of new gamelogs applied.
+    def update(self, data):
+        row_indexes = []
+        occurrences = []
+        times = []
+        entries = []
+        counts = {}
+
+        for gamelog in data.get('gamelogs', []):
+            entity_id = gamelog[self.entity]['id']
+            key = (entity_id, gamelog['game']['id'])
+
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+
+            if entity_id not in self.rows:
+                self.rows[entity_id] = len(self.rows)
+            row = self.rows[entity_id]
+
+            stats = flatten_stats(gamelog.get('stats', {}))
+            for name in stats:
+                if name not in self.columns:
+                    self.columns[name] = len(self.columns)
+
+            # An entity can play more than once per day (e.g. doubleheaders)
+            occurrences.append(counts.get(row, 0))
+            counts[row] = counts.get(row, 0) + 1
+
+            row_indexes.append(row)
+            times.append(_game_time(gamelog))
+            entries.append(stats)
+
+        if len(entries) == 0:
+            return 0
+
+        self.__reserve(len(self.rows), len(self.columns))
+
+        values = np.zeros((len(entries), self.totals.shape[1]))
+        for i, stats in enumerate(entries):
+            for name, value in stats.items():
+                values[i, self.columns[name]] = value
+
+        rows = np.array(row_indexes, dtype=np.int64)
+        times = np.array(times, dtype=np.int64)
+        occurrences = np.array(occurrences, dtype=np.int64)
+
+        np.add.at(self.totals, rows, values)
+        np.add.at(self.games, rows, 1)
+
+        # Each game replaces the oldest of its row's recent games if it is newer, which keeps
+        # the latest 'window' games whatever order they arrive in.  Rows are unique within an
+        # occurrence, so each occurrence is applied as a single vectorized step.
+        for occurrence in range(occurrences.max() + 1):
+            selected = occurrences == occurrence
+            group_rows = rows[selected]
+            group_times = times[selected]
+
+            slots = self.recent_times[group_rows].argmin(axis=1)
+            newer = group_times > self.recent_times[group_rows, slots]
+
+            self.recent[group_rows[newer], slots[newer], :] = values[selected][newer]
+            self.recent_times[group_rows[newer], slots[newer]] = group_times[newer]
+
+        return len(entries)
+
+    # Ids of the tracked players/teams, in row order
+    def ids(self):
+        ids = [None] * len(self.rows)
+        for entity_id, row in self.rows.items():
+            ids[row] = entity_id
+
+        return ids
+
+    # Stat names, in column order
+    def stat_names(self):
+        names = [None] * len(self.columns)
+        for name, column in self.columns.items():
+            names[column] = name
+
+        return names
+
+    # Season-to-date totals (one row per id, one column per stat)
+    def season_totals(self):
+        return self.totals[:len(self.rows), :len(self.columns)]
+
+    # Games played per id
+    def games_played(self):
+        return self.games[:len(self.rows)]
+
+    # Season-to-date per-game averages
+    def per_game_averages(self):
+        games = self.games_played()[:, None]
+
+        return np.divide(self.season_totals(), games, out=np.zeros(self.season_totals().shape), where=games > 0)
+
+    # Totals over each id's last 'window' games
+    def rolling_totals(self):
+        return self.recent[:len(self.rows), :, :len(self.columns)].sum(axis=1)
+
+    # Per-game averages over each id's last 'window' games
+    def rolling_averages(self):
+        games = (self.recent_times[:len(self.rows)] >= 0).sum(axis=1)[:, None]
+
+        return np.divide(self.rolling_totals(), games, out=np.zeros(self.rolling_totals().shape), where=games > 0)
+
+    # All figures for a single player/team, keyed by stat name
+    def get(self, entity_id):
+        row = self.rows[entity_id]
+        names = self.stat_names()
+        games = self.games[row]
+
+        return {
+            'gamesPlayed': int(games),
+            'totals': dict(zip(names, self.season_totals()[row].tolist())),
+            'averages': dict(zip(names, self.per_game_averages()[row].tolist())),
+            'rolling': dict(zip(names, self.rolling_averages()[row].tolist())),
+        }
+
+    # Persist the accumulator state to a .npz file
+    def save(self, path):
+        np.savez(path,
+                 entity=np.array(self.entity),
+                 window=np.array(self.window),
+                 ids=np.array(self.ids()),
+                 stat_names=np.array(self.stat_names(), dtype=str),
+                 totals=self.season_totals(),
+                 games=self.games_played(),
+                 recent=self.recent[:len(self.rows), :, :len(self.columns)],
+                 recent_times=self.recent_times[:len(self.rows)],
+                 seen=np.array(sorted(self.seen), dtype=np.int64).reshape(-1, 2))
+
+    # Reload an accumulator saved with save()
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as state:
+            accumulator = cls(str(state['entity']), int(state['window']))
+
+            accumulator.rows = dict((entity_id, row) for row, entity_id in enumerate(state['ids'].tolist()))
+            accumulator.columns = dict((name, column) for column, name in enumerate(state['stat_names'].tolist()))
+            accumulator.totals = state['totals'].copy()
+            accumulator.games = state['games'].copy()
+            accumulator.recent = state['recent'].copy()
+            accumulator.recent_times = state['recent_times'].copy()
+            accumulator.seen = set(tuple(pair) for pair in state['seen'].tolist())
+
+        return accumulator
@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import zlib
+import array
+import bisect
+import datetime
+import itertools
+
+from ohmysportsfeedspy.store import FileStore
+from ohmysportsfeedspy.pagination import page_records
+
+
+# Parse a v2.x timestamp (e.g. '2019-09-05T23:48:14.363Z') into epoch seconds
+def _parse_time(value):
+    moment = datetime.datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+    return int((moment - datetime.datetime(1970, 1, 1)).total_seconds())
+
+
+# Id of the game (or future) an odds entry belongs to
+def _entry_id(entry):
+    for name in ['game', 'future', 'event']:
+        if isinstance(entry.get(name), dict) and 'id' in entry[name]:
+            return entry[name]['id']
+
+    return entry.get('id')
+
+
+# Flatten the numeric fields of a market snapshot into {'path.to.field': value}
+def _flatten(value, prefix, flat):
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if key != 'asOfTime':
+                _flatten(child, prefix + "." + key, flat)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        flat[prefix] = float(value)
+
+
+# Current line values quoted by one sportsbook, as {field name: (timestamp, value)}.  Markets
+# hold lists of snapshots; the latest one per game segment is used, timed by its asOfTime
+# (or 'timestamp' when it has none).
+def _line_values(line, timestamp):
+    values = {}
+
+    for market, snapshots in line.items():
+        if not isinstance(snapshots, list):
+            continue
+
+        latest = {}
+        for snapshot in snapshots:
+            segment = None
+            for child in snapshot.values():
+                if isinstance(child, dict) and 'gameSegment' in child:
+                    segment = child['gameSegment']
+
+            if segment not in latest or snapshot.get('asOfTime', "") >= latest[segment].get('asOfTime', ""):
+                latest[segment] = snapshot
+
+        for segment, snapshot in latest.items():
+            prefix = market if segment == None else market + "." + segment
+            moment = _parse_time(snapshot['asOfTime']) if snapshot.get('asOfTime') else timestamp
+
+            flat = {}
+            _flatten(snapshot, prefix, flat)
+
+            for field, value in flat.items():
+                values[field] = (moment, value)
+
+    return values
+
+
+# Change history of a single (game, sportsbook, field) line.  A point is only kept when the
+# value moved, and points must arrive in time order.
+class LineSeries(object):
+
+    # Constructor
+    def __init__(self):
+        self.times = array.array('q')
+        self.values = array.array('d')
+
+    # Number of recorded points
+    def __len__(self):
+        return len(self.values)
+
+    # Time of the latest point (0 if there is none)
+    @property
+    def last_time(self):
+        return self.times[-1] if len(self.times) > 0 else 0
+
+    # Append a point if the value differs from the last one.  Returns True if it was kept.
+    def append(self, timestamp, value):
+        if timestamp < self.last_time:
+            raise ValueError("Point at {} is older than the latest point at {}.".format(timestamp, self.last_time))
+
+        if len(self.values) > 0 and self.values[-1] == value:
+            return False
+
+        self.times.append(timestamp)
+        self.values.append(value)
+
+        return True
+
+    # Times delta-encoded against the previous point, as stored on disk
+    def deltas(self):
+        return array.array('q', (time - previous for time, previous in zip(self.times, itertools.chain([0], self.times))))
+
+    # List of (timestamp, value) points
+    def points(self):
+        return list(zip(self.times, self.values))
+
+
+# Compact history of odds feeds ('seasonal_game_lines', 'daily_game_lines', 'daily_futures').
+# Each snapshot is diffed against the previous one and only lines that moved are kept, as
+# columnar series per game, sportsbook and field.  A time-ordered log of every point serves
+# range queries across all series.
+class OddsHistory(object):
+
+    MAGIC = b"MSFODDS1"
+
+    # Constructor
+    def __init__(self):
+        # (game id, sportsbook, field) -> LineSeries
+        self.series = {}
+
+        # game id -> keys of its series, for per-game lookups
+        self.keys_by_game = {}
+
+        # Keys of the series, by series number
+        self.keys = []
+        self.numbers = {}
+
+        # Every point in time order, as (time, series number, index in the series)
+        self.log_times = array.array('q')
+        self.log_series = array.array('l')
+        self.log_points = array.array('l')
+
+    # Register a new series
+    def __add_series(self, key, series):
+        self.series[key] = series
+        self.numbers[key] = len(self.keys)
+        self.keys.append(key)
+
+        if key[0] not in self.keys_by_game:
+            self.keys_by_game[key[0]] = []
+        self.keys_by_game[key[0]].append(key)
+
+    # Add a point to the time-ordered log (usually at its end)
+    def __log_point(self, timestamp, key, index):
+        position = bisect.bisect_right(self.log_times, timestamp)
+
+        self.log_times.insert(position, timestamp)
+        self.log_series.insert(position, self.numbers[key])
+        self.log_points.insert(position, index)
+
+    # Record a snapshot of an odds feed.  Each line is timed by its own asOfTime, falling back
+    # to 'timestamp' (by default the feed's lastUpdatedOn).  Lines older than the latest point
+    # already recorded for them are skipped.  Returns the number of lines that moved.
+    def record(self, data, timestamp=None):
+        if timestamp == None:
+            if data.get('lastUpdatedOn'):
+                timestamp = _parse_time(data['lastUpdatedOn'])
+            else:
+                timestamp = int(time.time())
+
+        changes = 0
+
+        for entry in page_records(data):
+            entry_id = _entry_id(entry)
+
+            for line in entry.get('lines', []):
+                book = line.get('source', {}).get('name', "")
+
+                for field, (moment, value) in _line_values(line, timestamp).items():
+                    key = (entry_id, book, field)
+
+                    if key not in self.series:
+                        self.__add_series(key, LineSeries())
+
+                    series = self.series[key]
+
+                    if moment < series.last_time:
+                        continue
+
+                    if series.append(moment, value):
+                        self.__log_point(moment, key, len(series) - 1)
+                        changes += 1
+
+        return changes
+
+    # Line history of a game as {(sportsbook, field): [(timestamp, value), ...]}
+    def history(self, game_id, book=None):
+        result = {}
+
+        for key in self.keys_by_game.get(game_id, []):
+            entry_id, line_book, field = key
+
+            if book == None or line_book == book:
+                result[(line_book, field)] = self.series[key].points()
+
+        return result
+
+    # Every line move between start and end (epoch seconds, inclusive), in time order, as
+    # (timestamp, game id, sportsbook, field, previous value, new value)
+    def moves(self, start, end):
+        result = []
+
+        first = bisect.bisect_left(self.log_times, start)
+        last = bisect.bisect_right(self.log_times, end)
+
+        for position in range(first, last):
+            index = self.log_points[position]
+
+            # The first point of a series is its opening line, not a move
+            if index == 0:
+                continue
+
+            key = self.keys[self.log_series[position]]
+            values = self.series[key].values
+
+            result.append((self.log_times[position], key[0], key[1], key[2], values[index - 1], values[index]))
+
+        return result
+
+    # Persist the history as a compressed binary file (written atomically)
+    def save(self, path):
+        index = []
+        blobs = []
+
+        for key, series in self.series.items():
+            index.append([list(key), len(series), series.last_time])
+            blobs.append(series.deltas().tobytes())
+            blobs.append(series.values.tobytes())
+
+        header = json.dumps(index).encode("utf-8")
+        body = zlib.compress(len(header).to_bytes(8, 'little') + header + b"".join(blobs))
+
+        store = FileStore(os.path.dirname(os.path.abspath(path)))
+        store.write(os.path.basename(path), [self.MAGIC, body])
+
+    # Reload a history saved with save()
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError("'" + path + "' is not an odds history file.")
+            body = zlib.decompress(f.read())
+
+        header_size = int.from_bytes(body[:8], 'little')
+        index = json.loads(body[8:8 + header_size].decode("utf-8"))
+        offset = 8 + header_size
+
+        history = cls()
+        points = []
+
+        for key, count, last_time in index:
+            series = LineSeries()
+            key = tuple(key)
+
+            deltas = array.array('q')
+            size = count * deltas.itemsize
+            deltas.frombytes(body[offset:offset + size])
+            offset += size
+
+            series.times.extend(itertools.accumulate(deltas))
+
+            size = count * series.values.itemsize
+            series.values.frombytes(body[offset:offset + size])
+            offset += size
+
+            history.__add_series(key, series)
+
+            number = history.numbers[key]
+            points.extend((timestamp, number, i) for i, timestamp in enumerate(series.times))
+
+        points.sort()
+
+        history.log_times.extend(point[0] for point in points)
+        history.log_series.extend(point[1] for point in points)
+        history.log_points.extend(point[2] for point in points)
+
+        return history
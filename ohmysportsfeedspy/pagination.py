@@ -0,0 +1,116 @@
+import json
+import time
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+# Limits requests to 'calls' per 'period' seconds, shared by all threads of a client
+class RateLimiter(object):
+
+    # Constructor
+    def __init__(self, calls, period=1.0):
+        self.calls = calls
+        self.period = period
+        self.__lock = threading.Lock()
+        self.__sent = collections.deque()
+
+    # Block until another request may be sent
+    def wait(self):
+        while True:
+            with self.__lock:
+                now = time.time()
+
+                while len(self.__sent) > 0 and now - self.__sent[0] >= self.period:
+                    self.__sent.popleft()
+
+                if len(self.__sent) < self.calls:
+                    self.__sent.append(now)
+                    return
+
+                delay = self.period - (now - self.__sent[0])
+
+            time.sleep(delay)
+
+
+# Find the list of records in a v2.x JSON response (e.g. 'players' or 'gamelogs')
+def page_records(data):
+    for key, value in data.items():
+        if key != 'references' and isinstance(value, list):
+            return value
+
+    return []
+
+
+# Errors worth retrying when fetching a page: API errors (raised as Warning), network
+# failures and truncated downloads
+RETRYABLE_ERRORS = (Warning, requests.RequestException, json.JSONDecodeError)
+
+
+# Lazily fetch consecutive pages starting at 'offset', up to 'limit' records in total (all of
+# them if None).  Pages are fetched in rounds of 1, 2, 4... up to 'workers' concurrent requests,
+# so small results cost no extra requests and at most a round is fetched past the last page.
+# Pages are yielded in order; fetching stops after the first page holding fewer records than
+# were asked for.
+def iter_pages(fetch_page, page_size, workers=4, retries=2, offset=0, limit=None, retry_delay=0.5):
+
+    # Fetch one page, retrying failed requests
+    def fetch(page_offset, page_limit):
+        attempt = 0
+
+        while True:
+            try:
+                return fetch_page(page_offset, page_limit)
+            except RETRYABLE_ERRORS:
+                attempt += 1
+                if attempt > retries:
+                    raise
+
+                time.sleep(retry_delay * attempt)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = collections.deque()
+    next_offset = offset
+    end = None if limit == None else offset + limit
+    round_size = 1
+
+    try:
+        while end == None or next_offset < end:
+            for i in range(round_size):
+                if end != None and next_offset >= end:
+                    break
+
+                page_limit = page_size if end == None else min(page_size, end - next_offset)
+                pending.append((executor.submit(fetch, next_offset, page_limit), page_limit))
+                next_offset += page_limit
+
+            done = False
+
+            while len(pending) > 0:
+                future, page_limit = pending.popleft()
+                page = future.result()
+
+                yield page
+
+                if len(page_records(page)) < page_limit:
+                    done = True
+                    break
+
+            if done:
+                break
+
+            round_size = min(round_size * 2, workers)
+    finally:
+        for future, page_limit in pending:
+            future.cancel()
+
+        executor.shutdown(wait=False)
+
+
+# Lazily iterate over the records of every page
+def iter_paginated_records(fetch_page, page_size, workers=4, retries=2, offset=0, limit=None, retry_delay=0.5):
+    for page in iter_pages(fetch_page, page_size, workers, retries, offset, limit, retry_delay):
+        for record in page_records(page):
+            yield record
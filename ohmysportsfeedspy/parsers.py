@@ -0,0 +1,357 @@
+import re
+import csv
+import json
+import marshal
+import xml.etree.ElementTree as ET
+
+
+# Decode raw byte lines (from a response or a stored file) into text lines
+def _decode_lines(lines, encoding='utf-8'):
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode(encoding)
+
+        yield line
+
+
+# Requested field names, lowercased for case-insensitive matching
+def _normalize_fields(fields):
+    if fields == None or isinstance(fields, frozenset):
+        return fields
+
+    return frozenset(str(field).lower() for field in fields)
+
+
+# Check if a column or stat name was requested, given fields from _normalize_fields().
+# Prefixed names (e.g. 'Stats-Pts') also match on their last part, and v1.x stats (named
+# e.g. 'Pts') also match on their abbreviation ('PTS'), as used by the API's filters.
+def _is_selected(name, fields, abbreviation=None):
+    if fields == None:
+        return True
+
+    name = name.lower()
+    if name in fields or name.split('-')[-1] in fields:
+        return True
+
+    return abbreviation != None and str(abbreviation).lower() in fields
+
+
+# Keep only the requested entries of a stats block, dropping categories left empty
+def prune_stats(stats, fields):
+    if not isinstance(stats, dict):
+        return stats
+
+    fields = _normalize_fields(fields)
+    pruned = {}
+
+    for name, value in stats.items():
+        abbreviation = value.get('@abbreviation') if isinstance(value, dict) else None
+
+        if _is_selected(name, fields, abbreviation):
+            pruned[name] = value
+        elif isinstance(value, dict):
+            value = prune_stats(value, fields)
+            if len(value) > 0:
+                pruned[name] = value
+
+    return pruned
+
+
+# Build a json object_pairs_hook that prunes unrequested stats while decoding.  Each
+# 'stats' block is pruned as soon as its owning object is built, so the full tree of
+# a large feed is never held in memory.
+def make_stats_pruner(fields):
+    fields = _normalize_fields(fields)
+
+    def hook(pairs):
+        obj = {}
+
+        for name, value in pairs:
+            if name == 'stats':
+                value = prune_stats(value, fields)
+
+            obj[name] = value
+
+        return obj
+
+    return hook
+
+
+# Decode a JSON feed, optionally pruning stats to the requested fields
+def load_json(content, fields=None):
+    if fields == None:
+        return json.loads(content)
+
+    return json.loads(content, object_pairs_hook=make_stats_pruner(fields))
+
+
+# Decode a JSON feed in a worker process.  The source is either the raw payload or the
+# path of a stored file (so large payloads needn't be sent to the worker), and the result
+# is returned in marshal format, which is far cheaper to transfer than a pickled dict tree.
+def decode_json_for_transfer(source, fields=None):
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            source = f.read()
+
+    return marshal.dumps(load_json(source, fields))
+
+
+# Decode a JSON feed in a pool of worker processes, waiting for the result
+def load_json_in_pool(executor, source, fields=None):
+    return marshal.loads(executor.submit(decode_json_for_transfer, source, fields).result())
+
+
+# Tokens marking a CSV column as identity/descriptive data rather than a stat
+IDENTITY_TOKENS = set([
+    'ID', 'Id', 'Name', 'LastName', 'FirstName', 'Abbr', 'City', 'Country', 'Date', 'Time',
+    'Position', 'Height', 'Weight', 'Birth', 'Age', 'Rookie', 'Jersey', 'Num', 'Location',
+    'Venue', 'Status', 'Team', 'Player', 'Game', 'Injury', 'Season', 'Opponent', 'Home', 'Away',
+])
+
+
+# Check if a CSV column holds identity/descriptive data (as opposed to a stat)
+def _is_identity_column(name):
+    for token in re.split(r'[^A-Za-z0-9]+', name):
+        if token in IDENTITY_TOKENS:
+            return True
+
+    return False
+
+
+# Type of a CSV value: int, float or str.  Zero-padded numbers (e.g. jersey '07') are text.
+def _infer_type(value):
+    if len(value) > 1 and value[0] == '0' and value.isdigit():
+        return str
+
+    for kind in [int, float]:
+        try:
+            kind(value)
+            return kind
+        except ValueError:
+            pass
+
+    return str
+
+
+# Per-column types for a CSV feed.  Identity columns (ids, names, teams, dates...) are text,
+# and every other column takes the type (int, float or str) of its first non-empty value,
+# so each column keeps a single type for the whole stream.  'types' overrides the type of
+# named columns.  Values that don't fit their column's type are kept as text (or as floats
+# in int columns), never dropped.
+class CsvSchema(object):
+
+    # Constructor
+    def __init__(self, header, types=None, fields=None):
+        # v1.x feeds prefix every column name with '#'
+        self.columns = [name.lstrip('#') for name in header]
+        fields = _normalize_fields(fields)
+
+        # Indexes of the columns to build.  Fields only prune stat columns, so records keep
+        # the ids, names and teams identifying them.
+        self.selected = [index for index, name in enumerate(self.columns) if _is_identity_column(name) or _is_selected(name, fields)]
+
+        # None until the first value of the column is seen
+        self.types = []
+        for name in self.columns:
+            if types != None and name in types:
+                self.types.append(types[name])
+            elif _is_identity_column(name):
+                self.types.append(str)
+            else:
+                self.types.append(None)
+
+    # Convert a single value to its column type (None if it is empty)
+    def __coerce(self, index, value):
+        if value == "":
+            return None
+
+        kind = self.types[index]
+        if kind == None:
+            kind = self.types[index] = _infer_type(value)
+
+        if kind == str:
+            return value
+
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+
+        if kind == int:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+
+        return value
+
+    # Build a typed record from a raw CSV row
+    def record(self, row):
+        record = {}
+
+        for index in self.selected:
+            if index < len(row):
+                record[self.columns[index]] = self.__coerce(index, row[index])
+            else:
+                record[self.columns[index]] = None
+
+        return record
+
+
+# Iterate over typed records (dicts keyed by column name) parsed from CSV lines
+def iter_csv_records(lines, types=None, fields=None):
+    reader = csv.reader(_decode_lines(lines))
+
+    header = next(reader, None)
+    if header == None:
+        return
+
+    schema = CsvSchema(header, types, fields)
+
+    for row in reader:
+        if len(row) == 0:
+            continue
+
+        yield schema.record(row)
+
+
+# Iterate over typed records parsed from a stored CSV file, closing it when done
+def iter_csv_file(path, types=None, fields=None):
+    with open(path, 'rb') as f:
+        for record in iter_csv_records(f, types, fields):
+            yield record
+
+
+# Collect a stream of records into columns (a dict of lists keyed by column name)
+def records_to_columns(records):
+    columns = {}
+    count = 0
+
+    for record in records:
+        for name, value in record.items():
+            if name not in columns:
+                columns[name] = [None] * count
+
+            columns[name].append(value)
+
+        count += 1
+
+        # Pad columns missing from this record
+        for values in columns.values():
+            if len(values) < count:
+                values.append(None)
+
+    return columns
+
+
+# Strip the namespace from an element tag
+def _local_name(tag):
+    if tag[0] == '{':
+        return tag[tag.index('}') + 1:]
+
+    return tag
+
+
+# Convert element text to an int or float where it represents one
+def _convert_text(text):
+    if text == None:
+        return None
+
+    text = text.strip()
+
+    if text == "" or (len(text) > 1 and text[0] == '0' and text.isdigit()):
+        return text
+
+    try:
+        return int(text)
+    except ValueError:
+        pass
+
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+# Convert an element and its children into a record (a dict keyed by local tag name).
+# When fields are given, unrequested children of 'stats' elements are skipped.
+def element_to_record(element, fields=None):
+    children = list(element)
+    fields = _normalize_fields(fields)
+
+    if fields != None and _local_name(element.tag) == 'stats':
+        children = [child for child in children if _is_selected(_local_name(child.tag), fields, child.get('abbreviation'))]
+
+    if len(children) == 0 and len(element.attrib) == 0:
+        return _convert_text(element.text)
+
+    record = {}
+
+    for name, value in element.attrib.items():
+        record['@' + _local_name(name)] = _convert_text(value)
+
+    for child in children:
+        name = _local_name(child.tag)
+        value = element_to_record(child, fields)
+
+        # Repeated tags become lists
+        if name in record:
+            if not isinstance(record[name], list):
+                record[name] = [record[name]]
+            record[name].append(value)
+        else:
+            record[name] = value
+
+    if len(children) == 0:
+        text = _convert_text(element.text)
+        if text != None and text != "":
+            record['#text'] = text
+
+    return record
+
+
+# Iterate over elements parsed incrementally from an XML stream.  Each element whose local
+# tag name matches 'tag' is yielded and then discarded, so memory stays bounded by the size
+# of a single record element.
+def iter_xml_elements(source, tag):
+    if tag == None:
+        raise ValueError("A record tag is required to stream XML (e.g. 'gamelog').")
+
+    parents = []
+    matched = None
+
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if matched == None and _local_name(element.tag) == tag:
+                matched = element
+
+            parents.append(element)
+            continue
+
+        parents.pop()
+
+        # Children of a matched element are kept until the whole element is yielded
+        if matched != None and element is not matched:
+            continue
+
+        if element is matched:
+            matched = None
+            yield element
+
+        # Drop finished elements from their parent so they can be collected
+        element.clear()
+        if len(parents) > 0:
+            parents[-1].remove(element)
+
+
+# Iterate over records parsed incrementally from an XML stream
+def iter_xml_records(source, tag, fields=None):
+    for element in iter_xml_elements(source, tag):
+        yield element_to_record(element, fields)
+
+
+# Iterate over records parsed incrementally from a stored XML file, closing it when done
+def iter_xml_file(path, tag, fields=None):
+    with open(path, 'rb') as f:
+        for record in iter_xml_records(f, tag, fields):
+            yield record
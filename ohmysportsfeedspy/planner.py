@@ -0,0 +1,328 @@
+import datetime
+
+from ohmysportsfeedspy.parsers import prune_stats
+
+
+# Parse a date given as a datetime.date or a 'YYYYMMDD' string
+def _parse_date(value):
+    if value == None or isinstance(value, datetime.date):
+        return value
+
+    return datetime.datetime.strptime(str(value), "%Y%m%d").date()
+
+
+# A logical need for gamelog data, independent of the feeds that can provide it
+class DataNeed(object):
+
+    KINDS = ['player_gamelogs', 'team_gamelogs']
+
+    # Constructor
+    def __init__(self, league, season, kind, start_date, end_date=None, players=None, teams=None, fields=None):
+        if kind not in self.KINDS:
+            raise ValueError("Unrecognized need '" + kind + "'.  Supported values are: " + str(self.KINDS))
+
+        self.league = league
+        self.season = season
+        self.kind = kind
+        self.start_date = _parse_date(start_date)
+        self.end_date = _parse_date(end_date) or self.start_date
+
+        # Player/team ids or slugs (e.g. 'stephen-curry', 'bos'); None means all
+        self.players = players
+        self.teams = teams
+
+        # Stat names to keep (e.g. 'points'); None means all
+        self.fields = fields
+
+    # Every date covered by the need
+    def dates(self):
+        days = (self.end_date - self.start_date).days
+
+        return [self.start_date + datetime.timedelta(days=i) for i in range(days + 1)]
+
+
+# A single feed request chosen by the planner, and the needs it covers
+class PlannedRequest(object):
+
+    # Constructor
+    def __init__(self, feed, league, season, params, needs, start_date, end_date=None):
+        self.feed = feed
+        self.league = league
+        self.season = season
+        self.params = params
+        self.needs = needs
+
+        # League dates the request covers
+        self.start_date = start_date
+        self.end_date = end_date or start_date
+
+    # Arguments for msf_get_data
+    def request_args(self):
+        kwargs = dict(league=self.league, season=self.season, feed=self.feed, format='json')
+        kwargs.update(self.params)
+
+        return kwargs
+
+    def __repr__(self):
+        return "PlannedRequest({}, {}, {}, {})".format(self.feed, self.league, self.season, self.params)
+
+
+# Plans the smallest set of v2.x feed requests covering a set of data needs, and splits the
+# results back per need.  Each group of needs for the same league, season and kind is served
+# either by daily feeds (one request per date not already in the store) or by the seasonal
+# feed filtered by date range, whichever the cost model rates cheaper.
+class RequestPlanner(object):
+
+    # Feeds able to serve each kind of need
+    FEEDS = {
+        'player_gamelogs': ('seasonal_player_gamelogs', 'daily_player_gamelogs'),
+        'team_gamelogs': ('seasonal_team_gamelogs', 'daily_team_gamelogs'),
+    }
+
+    # Estimated size of a full day of each feed, in KB
+    KB_PER_DAY = {
+        'player_gamelogs': 400,
+        'team_gamelogs': 20,
+    }
+
+    # Fixed cost of an upstream request, expressed in KB (latency and rate-limit usage)
+    REQUEST_COST_KB = 100
+
+    # Typical number of players/teams in a full day of gamelogs
+    ENTITIES_PER_DAY = {
+        'player_gamelogs': 250,
+        'team_gamelogs': 20,
+    }
+
+    # Constructor
+    def __init__(self, msf, max_age=None, utc_offset_hours=-5):
+        self.msf = msf
+        self.api = msf.api_instance
+
+        # Stored responses younger than this are reused instead of requested again
+        self.max_age = max_age
+
+        # Offset of the league's schedule dates from UTC (MySportsFeeds uses US Eastern)
+        self.utc_offset_hours = utc_offset_hours
+
+        if 'seasonal_player_gamelogs' not in self.api.valid_feeds:
+            raise ValueError("Request planning is only supported for v2.x of the API.")
+
+    # Check if a request can be served from the store
+    def __is_stored(self, kwargs):
+        if self.max_age == None:
+            return False
+
+        age = self.api.stored_age(**kwargs)
+
+        return age != None and age <= self.max_age
+
+    # Estimated cost of a request, or 0 if it will be served from the store
+    def __cost(self, request, kind, days):
+        if self.__is_stored(request.request_args()):
+            return 0
+
+        size = self.KB_PER_DAY[kind] * days
+
+        # Filters shrink the response roughly in proportion to the entities requested
+        for key in ['player', 'team']:
+            if key in request.params:
+                count = len(request.params[key].split(","))
+                size = size * min(1.0, float(count) / self.ENTITIES_PER_DAY[kind])
+
+        return self.REQUEST_COST_KB + size
+
+    # Filter params shared by a group of needs (only when every need restricts them)
+    def __filter_params(self, needs):
+        params = {}
+
+        for key, attribute in [('player', 'players'), ('team', 'teams'), ('stats', 'fields')]:
+            values = []
+
+            for need in needs:
+                if getattr(need, attribute) == None:
+                    values = None
+                    break
+
+                for value in getattr(need, attribute):
+                    if str(value) not in values:
+                        values.append(str(value))
+
+            if values:
+                params[key] = ",".join(values)
+
+        return params
+
+    # Candidate request sets for a group of needs as (cost, [PlannedRequest])
+    def __candidates(self, league, season, kind, needs):
+        seasonal_feed, daily_feed = self.FEEDS[kind]
+        filters = self.__filter_params([need for index, need in needs])
+        indexes = [index for index, need in needs]
+
+        candidates = []
+
+        # One request per date
+        dates = sorted(set(date for index, need in needs for date in need.dates()))
+        requests = []
+        cost = 0
+
+        for date in dates:
+            params = dict(filters)
+            params['date'] = date.strftime("%Y%m%d")
+
+            covered = [index for index, need in needs if need.start_date <= date <= need.end_date]
+            request = PlannedRequest(daily_feed, league, season, params, covered, date)
+
+            requests.append(request)
+            cost += self.__cost(request, kind, 1)
+
+        candidates.append((cost, requests))
+
+        # One seasonal request covering the whole group
+        start = min(need.start_date for index, need in needs)
+        end = max(need.end_date for index, need in needs)
+
+        params = dict(filters)
+        params['date'] = "from-{}-to-{}".format(start.strftime("%Y%m%d"), end.strftime("%Y%m%d"))
+
+        request = PlannedRequest(seasonal_feed, league, season, params, indexes, start, end)
+        candidates.append((self.__cost(request, kind, (end - start).days + 1), [request]))
+
+        # One seasonal request per need (avoids pulling the gaps between distant ranges)
+        if len(needs) > 1:
+            requests = []
+            cost = 0
+
+            for index, need in needs:
+                params = self.__filter_params([need])
+                params['date'] = "from-{}-to-{}".format(need.start_date.strftime("%Y%m%d"), need.end_date.strftime("%Y%m%d"))
+
+                request = PlannedRequest(seasonal_feed, league, season, params, [index], need.start_date, need.end_date)
+
+                requests.append(request)
+                cost += self.__cost(request, kind, len(need.dates()))
+
+            candidates.append((cost, requests))
+
+        return candidates
+
+    # Plan the requests covering a list of needs
+    def plan(self, needs):
+        groups = {}
+        order = []
+
+        for index, need in enumerate(needs):
+            key = (need.league, need.season, need.kind)
+
+            if key not in groups:
+                groups[key] = []
+                order.append(key)
+            groups[key].append((index, need))
+
+        planned = []
+
+        for key in order:
+            league, season, kind = key
+
+            candidates = self.__candidates(league, season, kind, groups[key])
+            cost, requests = min(candidates, key=lambda candidate: (candidate[0], len(candidate[1])))
+
+            planned.extend(requests)
+
+        return planned
+
+    # League date of a gamelog's game, estimated from its UTC start time
+    def __game_date(self, gamelog):
+        start = gamelog['game']['startTime']
+        start = datetime.datetime.strptime(start[:19], "%Y-%m-%dT%H:%M:%S")
+
+        return (start + datetime.timedelta(hours=self.utc_offset_hours)).date()
+
+    # Check if a player/team matches one of the requested ids or slugs
+    def __matches(self, entity, wanted):
+        if wanted == None:
+            return True
+
+        names = [str(entity.get('id'))]
+
+        if 'abbreviation' in entity:
+            names.append(entity['abbreviation'].lower())
+
+        if 'firstName' in entity and 'lastName' in entity:
+            names.append("{}-{}".format(entity['firstName'], entity['lastName']).lower().replace(" ", "-"))
+
+        for value in wanted:
+            value = str(value).lower()
+            if value in names or value.endswith("-" + names[0]):
+                return True
+
+        return False
+
+    # Copy a gamelog keeping only the requested stats, matched as get_data matches fields
+    def __project(self, gamelog, fields):
+        if fields == None or 'stats' not in gamelog:
+            return gamelog
+
+        projected = dict(gamelog)
+        projected['stats'] = prune_stats(gamelog['stats'], fields)
+
+        return projected
+
+    # Fetch the planned requests and split the gamelogs back per need.  Returns a list with
+    # one {'gamelogs': [...]} result for each need, in the order the needs were given.
+    def execute(self, needs, planned=None):
+        if planned == None:
+            planned = self.plan(needs)
+
+        results = [{'gamelogs': []} for need in needs]
+        seen = [set() for need in needs]
+
+        for request in planned:
+            kwargs = request.request_args()
+            if self.max_age != None:
+                kwargs['max_age'] = self.max_age
+
+            data = self.msf.msf_get_data(**kwargs)
+
+            # The API already filtered the response by league date, so gamelogs only need
+            # dating when the request spans dates outside a need (e.g. merged ranges)
+            trusted = [need.start_date <= request.start_date and request.end_date <= need.end_date for need in needs]
+
+            # Likewise the stats filter: needs asking for exactly the requested stats are used
+            # as returned, since the filter takes abbreviations (e.g. 'AB') that don't match
+            # the stat names in the response ('atBats')
+            requested = request.params.get('stats')
+            if requested != None:
+                requested = set(requested.split(","))
+
+            for gamelog in data.get('gamelogs', []):
+                date = None
+
+                for index in request.needs:
+                    need = needs[index]
+
+                    if not trusted[index]:
+                        if date == None:
+                            date = self.__game_date(gamelog)
+
+                        if not need.start_date <= date <= need.end_date:
+                            continue
+
+                    if need.kind == 'player_gamelogs' and not self.__matches(gamelog.get('player', {}), need.players):
+                        continue
+
+                    if not self.__matches(gamelog.get('team', {}), need.teams):
+                        continue
+
+                    # Overlapping requests may return the same gamelog twice
+                    key = (gamelog['game']['id'], gamelog.get('player', {}).get('id'), gamelog.get('team', {}).get('id'))
+                    if key in seen[index]:
+                        continue
+                    seen[index].add(key)
+
+                    if need.fields != None and set(str(field) for field in need.fields) == requested:
+                        results[index]['gamelogs'].append(gamelog)
+                    else:
+                        results[index]['gamelogs'].append(self.__project(gamelog, need.fields))
+
+        return results
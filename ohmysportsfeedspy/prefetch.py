@@ -0,0 +1,171 @@
+import datetime
+
+
+# Warms the store with the feeds that will be needed for upcoming games, so that
+# requests made at peak time (with a max_age) can be served locally
+class Prefetcher(object):
+
+    # Feeds requested once per upcoming date, per API generation
+    V1_DAILY_FEEDS = ['daily_game_schedule', 'daily_dfs']
+    V2_DAILY_FEEDS = ['daily_games', 'daily_dfs', 'daily_game_lines']
+
+    # Feeds requested once per prefetch run
+    LEAGUE_FEEDS = ['player_injuries']
+
+    # Constructor
+    def __init__(self, msf, league, season, budget=20, horizon_days=1, max_age=3600,
+                 schedule_max_age=86400, game_feeds=None, output_format='json',
+                 quiet_hours=None, utc_offset_hours=-5):
+        self.msf = msf
+        self.api = msf.api_instance
+        self.league = league
+        self.season = season
+
+        # Most upstream requests a single warm() may make
+        self.budget = budget
+
+        self.horizon_days = horizon_days
+        self.max_age = max_age
+        self.schedule_max_age = schedule_max_age
+        self.game_feeds = game_feeds or []
+        self.output_format = output_format
+
+        # (start_hour, end_hour) in local time during which warming is allowed
+        self.quiet_hours = quiet_hours
+
+        # Offset of the league's schedule dates from UTC (MySportsFeeds uses US Eastern)
+        self.utc_offset_hours = utc_offset_hours
+
+        self.is_v2 = 'daily_games' in self.api.valid_feeds
+        self.requests_made = 0
+
+    # Check if the current time falls within the configured quiet hours
+    def is_quiet(self, now=None):
+        if self.quiet_hours == None:
+            return True
+
+        hour = (now or datetime.datetime.now()).hour
+        start, end = self.quiet_hours
+
+        if start <= end:
+            return start <= hour < end
+
+        # Window wraps around midnight
+        return hour >= start or hour < end
+
+    # Build the get_data arguments for a feed of this league and season
+    def __request_args(self, feed, params, output_format=None):
+        kwargs = dict(league=self.league, season=self.season, feed=feed, format=output_format or self.output_format)
+        kwargs.update(params)
+
+        return kwargs
+
+    # Check if a request is already in the store and recent enough
+    def __is_fresh(self, kwargs, max_age):
+        age = self.api.stored_age(**kwargs)
+
+        return age != None and age <= max_age
+
+    # Read the season schedule as a list of (date, game_id) for upcoming games
+    def schedule(self):
+        if self.is_v2:
+            feed = 'seasonal_games'
+        else:
+            feed = 'full_game_schedule'
+
+        kwargs = self.__request_args(feed, {}, 'json')
+
+        if not self.__is_fresh(kwargs, self.schedule_max_age):
+            self.requests_made += 1
+
+        data = self.msf.msf_get_data(max_age=self.schedule_max_age, **kwargs)
+
+        games = []
+
+        if self.is_v2:
+            offset = datetime.timedelta(hours=self.utc_offset_hours)
+
+            for game in data.get('games', []):
+                start = game['schedule']['startTime']
+                start = datetime.datetime.strptime(start[:19], "%Y-%m-%dT%H:%M:%S") + offset
+
+                games.append((start.date(), game['schedule']['id']))
+        else:
+            for game in data.get('fullgameschedule', {}).get('gameentry', []):
+                date = datetime.datetime.strptime(game['date'], "%Y-%m-%d").date()
+
+                games.append((date, game['id']))
+
+        return games
+
+    # Work out the (feed, params) requests needed for the games within the horizon
+    def plan(self, today=None):
+        today = today or datetime.date.today()
+        last_day = today + datetime.timedelta(days=self.horizon_days)
+
+        dates = []
+        game_ids = []
+
+        for date, game_id in self.schedule():
+            if today <= date <= last_day:
+                if date not in dates:
+                    dates.append(date)
+                game_ids.append(game_id)
+
+        planned = []
+
+        for feed in self.LEAGUE_FEEDS:
+            if feed in self.api.valid_feeds:
+                planned.append((feed, {}))
+
+        if self.is_v2:
+            daily_feeds = self.V2_DAILY_FEEDS
+            date_param = 'date'
+        else:
+            daily_feeds = self.V1_DAILY_FEEDS
+            date_param = 'fordate'
+
+        for date in sorted(dates):
+            for feed in daily_feeds:
+                if feed in self.api.valid_feeds:
+                    planned.append((feed, {date_param: date.strftime("%Y%m%d")}))
+
+        # Per-game feeds are keyed by the v2.x game id
+        if self.is_v2:
+            for game_id in game_ids:
+                for feed in self.game_feeds:
+                    planned.append((feed, {'game': str(game_id)}))
+
+        return planned
+
+    # Warm the store for upcoming games, stopping once the request budget is spent.
+    # Returns the (feed, params) requests that were fetched upstream.
+    def warm(self, today=None, now=None):
+        fetched = []
+
+        if not self.is_quiet(now):
+            return fetched
+
+        self.requests_made = 0
+
+        for feed, params in self.plan(today):
+            kwargs = self.__request_args(feed, params)
+
+            if self.__is_fresh(kwargs, self.max_age):
+                continue
+
+            if self.requests_made >= self.budget:
+                break
+
+            self.requests_made += 1
+
+            try:
+                self.msf.msf_get_data(**kwargs)
+            except Warning as e:
+                if self.msf.verbose:
+                    print("Prefetch of '{}' failed: {}".format(feed, e))
+                continue
+
+            fetched.append((feed, params))
+
+        return fetched
@@ -0,0 +1,125 @@
+import os
+import uuid
+import collections
+
+
+# Memory-budgeted container for the results of many requests.  Parsed results are kept in
+# memory, most recently used first, until their estimated size exceeds the budget; older
+# ones are then dropped and lazily reloaded from the file store the next time they are
+# accessed.  Each raw payload is kept in the store under a name of its own, so later
+# requests for the same feed (from any process sharing the store) can't change a result.
+class BoundedResults(object):
+
+    # Constructor
+    def __init__(self, msf, budget_bytes=256 * 1024 * 1024, expansion=6):
+        self.api = msf.api_instance
+        self.msf = msf
+
+        if self.api.store == None:
+            raise ValueError("BoundedResults requires store_type='file' to spill results.")
+
+        self.budget_bytes = budget_bytes
+
+        # Approximate ratio of parsed (in-memory) size to payload size
+        self.expansion = expansion
+
+        # key -> (data, estimated size), least recently used first
+        self.__loaded = collections.OrderedDict()
+
+        # key -> (get_data arguments, name of its payload copy), for every result held in
+        # memory or spilled
+        self.__requests = collections.OrderedDict()
+
+        # Payload copies are named after this container, to keep them apart from others
+        self.__prefix = "bounded-" + uuid.uuid4().hex[:12] + "-"
+        self.__copies = 0
+
+        self.used_bytes = 0
+
+    # Number of results held (in memory or spilled)
+    def __len__(self):
+        return len(self.__requests)
+
+    # Check if a result is held
+    def __contains__(self, key):
+        return key in self.__requests
+
+    # Keys of every result, in the order they were fetched
+    def keys(self):
+        return list(self.__requests.keys())
+
+    # Lazily iterate over (key, result) pairs, reloading spilled results as needed
+    def items(self):
+        for key in self.keys():
+            yield key, self[key]
+
+    # Number of results currently held in memory
+    def loaded_count(self):
+        return len(self.__loaded)
+
+    # Keep a copy of a request's stored payload, returning the name of the copy
+    def __copy_payload(self, kwargs):
+        path = self.api.stored_path(**kwargs)
+        if path == None:
+            raise AssertionError("Request for '" + kwargs.get('feed', '') + "' was not stored.")
+
+        self.__copies += 1
+        copy_name = self.__prefix + str(self.__copies) + os.path.splitext(path)[1]
+
+        self.api.store.snapshot(os.path.basename(path), copy_name)
+
+        return copy_name
+
+    # Estimated in-memory size of a result, from the size of its payload copy
+    def __estimate(self, copy_name):
+        return os.path.getsize(self.api.store.path(copy_name)) * self.expansion
+
+    # Keep a parsed result in memory, spilling the least recently used ones over budget
+    def __hold(self, key, data, size):
+        if key in self.__loaded:
+            self.used_bytes -= self.__loaded.pop(key)[1]
+
+        self.__loaded[key] = (data, size)
+        self.used_bytes += size
+
+        # Always keep the newest result, even if it alone exceeds the budget
+        while self.used_bytes > self.budget_bytes and len(self.__loaded) > 1:
+            spilled_key, (spilled, spilled_size) = self.__loaded.popitem(last=False)
+            self.used_bytes -= spilled_size
+
+    # Request data through the client and hold it under 'key'
+    def fetch(self, key, **kwargs):
+        if kwargs.get('stream') or kwargs.get('paginate'):
+            raise ValueError("Streamed and paginated requests can't be held in BoundedResults.")
+
+        data = self.msf.msf_get_data(**kwargs)
+        copy_name = self.__copy_payload(kwargs)
+
+        if key in self.__requests:
+            self.api.store.remove(self.__requests[key][1])
+
+        self.__requests[key] = (dict(kwargs), copy_name)
+        self.__hold(key, data, self.__estimate(copy_name))
+
+        return data
+
+    # Get a result, reloading it from the store if it was spilled
+    def __getitem__(self, key):
+        if key in self.__loaded:
+            self.__loaded.move_to_end(key)
+            return self.__loaded[key][0]
+
+        kwargs, copy_name = self.__requests[key]
+        data = self.api.load_file(copy_name, **kwargs)
+
+        self.__hold(key, data, self.__estimate(copy_name))
+
+        return data
+
+    # Stop holding a result
+    def __delitem__(self, key):
+        kwargs, copy_name = self.__requests.pop(key)
+        self.api.store.remove(copy_name)
+
+        if key in self.__loaded:
+            self.used_bytes -= self.__loaded.pop(key)[1]
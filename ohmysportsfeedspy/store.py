@@ -0,0 +1,96 @@
+import os
+import tempfile
+
+
+# Current process umask (it can only be read by setting it)
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+
+    return mask
+
+
+# File based store that can be shared by several processes.  Feed files are written to a
+# temporary file and atomically renamed into place, so readers never need a lock and always
+# see a complete file.  Each file's metadata lives in the file itself (its mtime is the time
+# it was last fetched or confirmed unchanged), so writers never contend on shared state.
+class FileStore(object):
+
+    # Constructor
+    def __init__(self, location):
+        self.location = location
+
+        # Mode of stored files, as a plain open() would create them.  Read once, since the
+        # umask can only be read by briefly changing it, which other threads would see.
+        self.mode = 0o666 & ~_umask()
+
+    # Full path of a stored file
+    def path(self, filename):
+        return os.path.join(self.location, filename)
+
+    # Check if a file is present in the store
+    def exists(self, filename):
+        return os.path.isfile(self.path(filename))
+
+    # Atomically write a file from an iterable of byte chunks
+    def write(self, filename, chunks):
+        os.makedirs(self.location, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.location, prefix="." + filename + ".", suffix=".tmp")
+
+        try:
+            size = 0
+
+            with os.fdopen(fd, "wb") as outfile:
+                for chunk in chunks:
+                    outfile.write(chunk)
+                    size += len(chunk)
+
+                outfile.flush()
+
+                # mkstemp creates files readable by their owner only, so restore the usual
+                # mode for other users sharing the store (not supported on Windows)
+                if hasattr(os, "fchmod"):
+                    os.fchmod(outfile.fileno(), self.mode)
+
+                os.fsync(outfile.fileno())
+
+            os.replace(temp_path, self.path(filename))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return size
+
+    # Keep a copy of a stored file under another name, unaffected by later writes of the
+    # original.  Writes replace files rather than modify them, so a hard link is enough where
+    # the filesystem supports one.
+    def snapshot(self, filename, copy_name):
+        self.remove(copy_name)
+
+        try:
+            os.link(self.path(filename), self.path(copy_name))
+        except OSError:
+            with open(self.path(filename), "rb") as infile:
+                self.write(copy_name, iter(lambda: infile.read(64 * 1024), b""))
+
+    # Remove a file from the store, if present
+    def remove(self, filename):
+        try:
+            os.remove(self.path(filename))
+        except FileNotFoundError:
+            pass
+
+    # Fetch time and size of a stored file, or None if it isn't in the store
+    def get_metadata(self, filename):
+        try:
+            stat = os.stat(self.path(filename))
+        except OSError:
+            return None
+
+        return {"fetched": stat.st_mtime, "size": stat.st_size}
+
+    # Mark a stored file as fetched now (e.g. when the API reports it unchanged)
+    def touch(self, filename):
+        os.utime(self.path(filename), None)
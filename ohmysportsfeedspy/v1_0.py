@@ -1,11 +1,16 @@
 import os
-import csv
 import requests
-import json
 import platform
+import time
+import hashlib
 import base64
 
+from concurrent.futures import ProcessPoolExecutor
+
 import ohmysportsfeedspy
+from ohmysportsfeedspy.store import FileStore
+from ohmysportsfeedspy.pagination import RateLimiter, iter_paginated_records
+from ohmysportsfeedspy.parsers import iter_csv_records, iter_csv_file, iter_xml_records, iter_xml_file, load_json, load_json_in_pool
 
 
 # API class for dealing with v1.0 of the API
@@ -23,6 +28,42 @@ class API_v1_0(object):
         self.store_type = store_type
         self.store_location = store_location
 
+        if self.store_type == "file":
+            self.store = FileStore(self.store_location)
+        else:
+            self.store = None
+
+        # Library options accepted by get_data (everything else is passed on as an API param)
+        self.default_options = {
+            'stream': False,
+            'record_tag': None,
+            'csv_types': None,
+            'fields': None,
+            'max_age': None,
+            'paginate': False,
+            'page_size': 100,
+            'workers': 4,
+        }
+
+        # Optional limit on the rate of requests sent upstream
+        self.rate_limiter = None
+
+        # Optional process pool for decoding JSON payloads of at least parse_threshold bytes
+        self.parse_executor = None
+        self.parse_threshold = 1024 * 1024
+
+        # Whether parse_executor was created here (and must be shut down here)
+        self.parse_executor_owned = False
+
+        # Size of the chunks read from streamed responses
+        self.stream_chunk_size = 64 * 1024
+
+        # Feeds accepting 'offset' and 'limit', which can be fetched with paginate=True
+        self.paginated_feeds = []
+
+        # Params already spelled out in stored filenames, or that don't change the response
+        self.filename_params = ["gameid", "fordate", "season", "date", "week", "game", "force"]
+
         self.valid_feeds = [
             'cumulative_player_stats',
             'full_game_schedule',
@@ -46,6 +87,18 @@ class API_v1_0(object):
             'latest_updates',
         ]
 
+        # Params used to push a field projection upstream, per feed
+        self.stats_filter_params = {
+            'cumulative_player_stats': 'playerstats',
+            'daily_player_stats': 'playerstats',
+            'player_gamelogs': 'playerstats',
+            'team_gamelogs': 'teamstats',
+            'overall_team_standings': 'teamstats',
+            'conference_team_standings': 'teamstats',
+            'division_team_standings': 'teamstats',
+            'playoff_team_standings': 'teamstats',
+        }
+
     # Verify a feed
     def __verify_feed(self, feedName):
         is_valid = False
@@ -85,43 +138,57 @@ class API_v1_0(object):
         if "fordate" in params:
             filename += "-" + params["fordate"]
 
+        # v2.x params that select a different slice of the same feed
+        for key in ["season", "date", "week", "game"]:
+            if key in params:
+                filename += "-" + str(params[key])
+
+        # Every other param (filters, sorting, projection, paging...) changes the response too,
+        # so they are summarized as a hash of the sorted params to keep those responses apart
+        others = sorted((key, str(value)) for key, value in params.items() if key not in self.filename_params)
+        if len(others) > 0:
+            filename += "-" + hashlib.sha1(repr(others).encode('utf-8')).hexdigest()[:12]
+
         filename += "." + output_format
 
         return filename
 
     # Save a feed response based on the store_type
     def __save_feed(self, response, league, season, feed, output_format, params):
-        # Save to memory regardless of selected method
-        if output_format == "json":
-            store_output = response.json()
-        elif output_format == "xml":
-            store_output = response.text
-        elif output_format == "csv":
-            #store_output = response.content.split('\n')
-            store_output = response.content.decode('utf-8')
-            store_output = csv.reader(store_output.splitlines(), delimiter=',')
-            store_output = list(store_output)
-
         if self.store_type == "file":
-            if not os.path.isdir(self.store_location):
-                os.mkdir(self.store_location)
+            filename = self.__make_output_filename(league, season, feed, output_format, params)
+
+            # Keep the body exactly as received
+            self.store.write(filename, [response.content])
 
+    # Stream a feed response to the store unchanged and return an incremental parser over it
+    def __stream_feed(self, response, league, season, feed, output_format, params, options):
+        if self.store_type == "file":
             filename = self.__make_output_filename(league, season, feed, output_format, params)
 
-            with open(self.store_location + filename, "w") as outfile:
-                if output_format == "json":  # This is JSON
-                    json.dump(store_output, outfile)
+            self.store.write(filename, response.iter_content(chunk_size=self.stream_chunk_size))
 
-                elif output_format == "xml":  # This is xml
-                    outfile.write(store_output)
+            return self.__parse_stored_feed(filename, output_format, options)
 
-                elif output_format == "csv":  # This is csv
-                    writer = csv.writer(outfile)
-                    for row in store_output:
-                        writer.writerow([row])
+        if output_format == "csv":
+            return iter_csv_records(response.iter_lines(chunk_size=self.stream_chunk_size), options['csv_types'], options['fields'])
 
-                else:
-                    raise AssertionError("Could not interpret feed output format")
+        elif output_format == "xml":
+            # Let the raw stream undo any gzip transfer encoding
+            response.raw.decode_content = True
+            return iter_xml_records(response.raw, options['record_tag'], options['fields'])
+
+        raise AssertionError("Could not interpret feed output format")
+
+    # Incrementally parse a previously stored feed
+    def __parse_stored_feed(self, filename, output_format, options):
+        if output_format == "csv":
+            return iter_csv_file(self.store.path(filename), options['csv_types'], options['fields'])
+
+        elif output_format == "xml":
+            return iter_xml_file(self.store.path(filename), options['record_tag'], options['fields'])
+
+        raise AssertionError("Could not interpret feed output format")
 
     # Indicate this version does support BASIC auth
     def supports_basic_auth(self):
@@ -132,16 +199,14 @@ class API_v1_0(object):
         self.auth = (username, password)
         self.headers['Authorization'] = 'Basic ' + base64.b64encode('{}:{}'.format(username,password).encode('utf-8')).decode('ascii')
 
-    # Request data (and store it if applicable)
-    def get_data(self, **kwargs):
-        if not self.auth:
-            raise AssertionError("You must authenticate() before making requests.")
-
+    # Split get_data arguments into the request, library options and API params
+    def __parse_args(self, kwargs):
         # establish defaults for all variables
         league = ""
         season = ""
         feed = ""
         output_format = ""
+        options = dict(self.default_options)
         params = {}
 
         # iterate over args and assign vars
@@ -157,9 +222,170 @@ class API_v1_0(object):
                 feed = value
             elif str(key) == 'format':
                 output_format = value
+            elif str(key) in options:
+                options[str(key)] = value
             else:
                 params[key] = value
 
+        return league, season, feed, output_format, options, params
+
+    # Ask the API for only the requested fields, where the feed supports it.  The API's
+    # filters take stat abbreviations while responses key stats by name (e.g. 'AB' for
+    # 'atBats'), so once the selection is sent upstream the response isn't pruned again.
+    def __push_down_fields(self, feed, options, params):
+        if options['fields'] == None or feed not in self.stats_filter_params:
+            return
+
+        key = self.stats_filter_params[feed]
+        if key not in params:
+            params[key] = ",".join(options['fields'])
+            options['fields'] = None
+
+    # Seconds since a request was last stored, or None if it isn't in the store
+    def stored_age(self, **kwargs):
+        if self.store == None:
+            return None
+
+        league, season, feed, output_format, options, params = self.__parse_args(kwargs)
+        self.__push_down_fields(feed, options, params)
+
+        filename = self.__make_output_filename(league, season, feed, output_format, params)
+
+        metadata = self.store.get_metadata(filename)
+        if metadata == None:
+            return None
+
+        return time.time() - metadata["fetched"]
+
+    # Path of the stored copy of a request, or None if it isn't in the store
+    def stored_path(self, **kwargs):
+        if self.store == None:
+            return None
+
+        league, season, feed, output_format, options, params = self.__parse_args(kwargs)
+        self.__push_down_fields(feed, options, params)
+
+        filename = self.__make_output_filename(league, season, feed, output_format, params)
+        if not self.store.exists(filename):
+            return None
+
+        return self.store.path(filename)
+
+    # Load a request from the store without contacting the API
+    def load_stored(self, **kwargs):
+        league, season, feed, output_format, options, params = self.__parse_args(kwargs)
+        self.__push_down_fields(feed, options, params)
+
+        filename = self.__make_output_filename(league, season, feed, output_format, params)
+        if self.store == None or not self.store.exists(filename):
+            raise AssertionError("Request for '" + feed + "' is not in the store.")
+
+        return self.__load_stored_feed(filename, output_format, options)
+
+    # Load a named file from the store (e.g. a copy of a stored feed), parsed as the response
+    # to the given request would be
+    def load_file(self, filename, **kwargs):
+        league, season, feed, output_format, options, params = self.__parse_args(kwargs)
+
+        if self.store == None or not self.store.exists(filename):
+            raise AssertionError("File '" + filename + "' is not in the store.")
+
+        return self.__load_stored_feed(filename, output_format, options)
+
+    # Read a previously stored feed
+    def __load_stored_feed(self, filename, output_format, options):
+        if options['stream']:
+            return self.__parse_stored_feed(filename, output_format, options)
+
+        if output_format == "json":
+            return self.__decode_json(None, self.store.path(filename), options)
+
+        with open(self.store.path(filename), encoding='utf-8') as f:
+            if output_format == "xml":
+                data = f.read()
+            else:
+                data = f.read().splitlines()
+
+        return data
+
+    # Decode large JSON payloads in a process pool (pass None to decode them in-process).
+    # Unless an executor is given, a ProcessPoolExecutor with 'workers' processes is created;
+    # it is shut down when replaced.  Executors given by the caller are left to the caller.
+    def set_parse_pool(self, executor=None, threshold=1024 * 1024, workers=None):
+        owned = False
+
+        if executor == None and workers != None:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            owned = True
+
+        if self.parse_executor_owned and self.parse_executor is not executor:
+            self.parse_executor.shutdown()
+
+        self.parse_executor = executor
+        self.parse_executor_owned = owned
+        self.parse_threshold = threshold
+
+    # Decode a JSON payload, off-process if it is large.  When the payload is also stored,
+    # its path is sent to the worker instead of the payload itself.
+    def __decode_json(self, content, path, options):
+        if content == None:
+            size = os.path.getsize(path)
+        else:
+            size = len(content)
+
+        if self.parse_executor != None and size >= self.parse_threshold:
+            return load_json_in_pool(self.parse_executor, path or content, options['fields'])
+
+        if content == None:
+            with open(path, 'rb') as f:
+                content = f.read()
+
+        return load_json(content, options['fields'])
+
+    # Limit requests sent upstream to 'calls' per 'period' seconds
+    def set_rate_limit(self, calls, period=1.0):
+        if calls == None:
+            self.rate_limiter = None
+        else:
+            self.rate_limiter = RateLimiter(calls, period)
+
+    # Lazily fetch a feed page by page (each page is requested and stored separately)
+    def __get_paginated(self, feed, kwargs, options, output_format, params):
+        if feed not in self.paginated_feeds:
+            raise ValueError("Pagination is not supported for feed '" + feed + "'.  Supported feeds are: " + str(self.paginated_feeds))
+
+        if output_format != 'json':
+            raise ValueError("Pagination is only supported for the 'json' format.")
+
+        page_kwargs = dict(kwargs)
+        page_kwargs['paginate'] = False
+        page_kwargs.pop('limit', None)
+        page_kwargs.pop('offset', None)
+
+        # The caller's offset and limit bound the records fetched across all pages
+        offset = int(params.get('offset', 0))
+        limit = params.get('limit')
+        if limit != None:
+            limit = int(limit)
+
+        def fetch_page(page_offset, page_limit):
+            return self.get_data(offset=page_offset, limit=page_limit, **page_kwargs)
+
+        return iter_paginated_records(fetch_page, options['page_size'], options['workers'], offset=offset, limit=limit)
+
+    # Request data (and store it if applicable)
+    def get_data(self, **kwargs):
+        if not self.auth:
+            raise AssertionError("You must authenticate() before making requests.")
+
+        league, season, feed, output_format, options, params = self.__parse_args(kwargs)
+        stream = options['stream']
+
+        if options['paginate']:
+            return self.__get_paginated(feed, kwargs, options, output_format, params)
+
+        self.__push_down_fields(feed, options, params)
+
         # add force=false parameter (helps prevent unnecessary bandwidth use)
         if not "force" in params:
             params['force'] = 'false'
@@ -170,6 +396,24 @@ class API_v1_0(object):
         if self.__verify_format(output_format) == False:
             raise ValueError("Unsupported format '" + output_format + "'.")
 
+        if stream and output_format == 'json':
+            raise ValueError("Streaming is only supported for the 'xml' and 'csv' formats.")
+
+        if stream and output_format == 'xml' and options['record_tag'] == None:
+            raise ValueError("Streaming XML requires a 'record_tag' naming the record element (e.g. 'gamelog').")
+
+        filename = self.__make_output_filename(league, season, feed, output_format, params)
+
+        # Serve recently stored data locally when the caller allows it
+        if options['max_age'] != None and params['force'] != 'true':
+            age = self.stored_age(**kwargs)
+
+            if age != None and age <= options['max_age']:
+                if self.verbose:
+                    print("Using stored data from {} seconds ago".format(int(age)))
+
+                return self.__load_stored_feed(filename, output_format, options)
+
         url = self.determine_url(league, season, feed, output_format, params)
 
         if self.verbose:
@@ -179,32 +423,37 @@ class API_v1_0(object):
             print(" and params:")
             print(params)
 
-        r = requests.get(url, params=params, headers=self.headers)
+        if self.rate_limiter != None:
+            self.rate_limiter.wait()
 
-        if r.status_code == 200:
+        r = requests.get(url, params=params, headers=self.headers, stream=stream)
+
+        if r.status_code == 200 and stream:
+            data = self.__stream_feed(r, league, season, feed, output_format, params, options)
+
+        elif r.status_code == 200:
             if self.store_type != None:
                 self.__save_feed(r, league, season, feed, output_format, params)
 
             if output_format == "json":
-                data = json.loads(r.content)
+                path = None
+                if self.store_type != None:
+                    path = self.store.path(filename)
+
+                data = self.__decode_json(r.content, path, options)
             elif output_format == "xml":
-                data = str(r.content)
+                data = r.text
             else:
-                data = r.content.splitlines()
+                data = r.content.decode('utf-8').splitlines()
 
         elif r.status_code == 304:
             if self.verbose:
                 print("Data hasn't changed since last call")
 
-            filename = self.__make_output_filename(league, season, feed, output_format, params)
+            # Unchanged data is as good as freshly fetched
+            self.store.touch(filename)
 
-            with open(self.store_location + filename) as f:
-                if output_format == "json":
-                    data = json.load(f)
-                elif output_format == "xml":
-                    data = str(f.readlines()[0])
-                else:
-                    data = f.read().splitlines()
+            data = self.__load_stored_feed(filename, output_format, options)
 
         else:
             raise Warning("API call failed with error: {error}".format(error=r.status_code))
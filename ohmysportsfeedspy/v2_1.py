@@ -40,6 +40,35 @@ class API_v2_1(API_v1_0):
             'daily_futures'
         ]
 
+        # Params used to push a field projection upstream, per feed
+        self.stats_filter_params = {
+            'seasonal_player_gamelogs': 'stats',
+            'daily_player_gamelogs': 'stats',
+            'weekly_player_gamelogs': 'stats',
+            'seasonal_team_gamelogs': 'stats',
+            'daily_team_gamelogs': 'stats',
+            'weekly_team_gamelogs': 'stats',
+            'seasonal_player_stats': 'stats',
+            'seasonal_team_stats': 'stats',
+            'seasonal_standings': 'stats',
+        }
+
+        # Feeds accepting 'offset' and 'limit', which can be fetched with paginate=True
+        self.paginated_feeds = [
+            'seasonal_games',
+            'daily_games',
+            'weekly_games',
+            'seasonal_player_gamelogs',
+            'daily_player_gamelogs',
+            'weekly_player_gamelogs',
+            'seasonal_team_gamelogs',
+            'daily_team_gamelogs',
+            'weekly_team_gamelogs',
+            'seasonal_player_stats',
+            'players',
+            'player_injuries',
+        ]
+
     # Feed URL
     def determine_url(self, league, season, feed, output_format, params):
         if feed == "seasonal_games":
@@ -1,5 +1,15 @@
+import io
+import json
 import pytest
-from api import MsfLib, BaseFeed, Feed
+import requests
+
+from ohmysportsfeedspy import MySportsFeeds
+
+try:
+    from api import MsfLib, BaseFeed, Feed
+except ImportError:
+    # The legacy fixtures below need the old 'api' module
+    MsfLib = BaseFeed = Feed = None
 
 
 @pytest.fixture(scope="module")
@@ -20,3 +30,72 @@ def feed():
     config = MsfLib(version="1.0")
     feed_ = Feed(config)
     return feed_
+
+
+# Canned response returned by the fake requests.get
+class FakeResponse(object):
+
+    def __init__(self, status_code, content=b""):
+        if isinstance(content, (dict, list)):
+            content = json.dumps(content).encode("utf-8")
+
+        self.status_code = status_code
+        self.content = content
+        self.raw = io.BytesIO(content)
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def iter_lines(self, chunk_size=1):
+        for line in self.content.splitlines():
+            yield line
+
+
+# Stand-in for requests.get that records every call and answers through a handler
+class FakeUpstream(object):
+
+    def __init__(self):
+        self.calls = []
+        self.handler = lambda url, params: FakeResponse(404)
+
+    def __call__(self, url, params=None, headers=None, stream=False, **kwargs):
+        self.calls.append((url, dict(params or {})))
+        return self.handler(url, dict(params or {}))
+
+    # Answer every request with the same status and body
+    def respond(self, status_code, content=b""):
+        self.handler = lambda url, params: FakeResponse(status_code, content)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(requests, "get", fake)
+    return fake
+
+
+@pytest.fixture
+def store_location(tmp_path):
+    return str(tmp_path) + "/"
+
+
+@pytest.fixture
+def msf_v1(store_location):
+    msf = MySportsFeeds('1.2', store_location=store_location)
+    msf.authenticate('apikey', 'password')
+    return msf
+
+
+@pytest.fixture
+def msf_v2(store_location):
+    msf = MySportsFeeds('2.1', store_location=store_location)
+    msf.authenticate('apikey', 'MYSPORTSFEEDS')
+    return msf
@@ -0,0 +1,59 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ohmysportsfeedspy.aggregate import StatAccumulator
+
+
+def daily_gamelogs(day, points, player_id=1):
+    return {'gamelogs': [{
+        'game': {'id': day, 'startTime': '2017-01-{:02d}T00:30:00.000Z'.format(day)},
+        'player': {'id': player_id},
+        'stats': {'offense': {'pts': points}},
+    }]}
+
+
+def test_totals_averages_and_rolling_window():
+    players = StatAccumulator('player', window=2)
+
+    for day, points in [(1, 10), (2, 20), (3, 30)]:
+        assert players.update(daily_gamelogs(day, points)) == 1
+
+    figures = players.get(1)
+    assert figures['gamesPlayed'] == 3
+    assert figures['totals'] == {'offense.pts': 60}
+    assert figures['averages'] == {'offense.pts': 20}
+    assert figures['rolling'] == {'offense.pts': 25}
+
+
+def test_backfilled_days_do_not_displace_later_games():
+    players = StatAccumulator('player', window=2)
+
+    for day, points in [(2, 20), (3, 30), (1, 10)]:
+        players.update(daily_gamelogs(day, points))
+
+    assert players.get(1)['rolling'] == {'offense.pts': 25}
+    assert players.get(1)['totals'] == {'offense.pts': 60}
+
+
+def test_reapplied_feeds_are_ignored():
+    players = StatAccumulator('player', window=2)
+
+    players.update(daily_gamelogs(1, 10))
+    assert players.update(daily_gamelogs(1, 10)) == 0
+    assert players.get(1)['gamesPlayed'] == 1
+
+
+def test_save_and_load(tmp_path):
+    players = StatAccumulator('player', window=2)
+    for day, points in [(3, 30), (1, 10)]:
+        players.update(daily_gamelogs(day, points))
+
+    path = str(tmp_path / 'players.npz')
+    players.save(path)
+
+    loaded = StatAccumulator.load(path)
+    loaded.update(daily_gamelogs(2, 20))
+
+    assert loaded.get(1)['rolling'] == {'offense.pts': 25}
+    assert loaded.update(daily_gamelogs(3, 30)) == 0
@@ -0,0 +1,73 @@
+from ohmysportsfeedspy.parsers import iter_csv_records, records_to_columns
+
+
+CSV_BODY = (b"#Player ID,#LastName,#Jersey Num,#Team Abbr.,#GamesPlayed,#Pts,#FgPct,#Ast,#Note\n"
+            b"10,Curry,30,GSW,79,25,47.5,6,Active\n"
+            b"11,Smith,07,CLE,12,,50,,Injured\n"
+            b"12,\"Doe, J\",5,BOS,3,3,,2,\n")
+
+
+def test_csv_schema_is_fixed_by_header_and_first_values():
+    records = list(iter_csv_records(CSV_BODY.splitlines()))
+
+    assert [r['Jersey Num'] for r in records] == ['30', '07', '5']
+    assert [r['Player ID'] for r in records] == ['10', '11', '12']
+    assert [r['GamesPlayed'] for r in records] == [79, 12, 3]
+    assert [r['Pts'] for r in records] == [25, None, 3]
+    assert [r['FgPct'] for r in records] == [47.5, 50.0, None]
+    assert [r['Note'] for r in records] == ['Active', 'Injured', None]
+    assert records[2]['LastName'] == 'Doe, J'
+
+
+def test_csv_columns_have_one_type():
+    columns = records_to_columns(iter_csv_records(CSV_BODY.splitlines()))
+
+    for name, values in columns.items():
+        assert len(set(type(value) for value in values if value != None)) <= 1, name
+
+
+def test_csv_values_that_do_not_fit_are_kept():
+    body = b"#Player ID,#Pts,#Ast\n10,25,6\n11,x,2.5\n"
+    records = list(iter_csv_records(body.splitlines()))
+
+    assert [r['Pts'] for r in records] == [25, 'x']
+    assert [r['Ast'] for r in records] == [6, 2.5]
+
+
+def test_csv_type_overrides():
+    records = list(iter_csv_records(CSV_BODY.splitlines(), types={'Player ID': int, 'Ast': int}))
+
+    assert records[0]['Player ID'] == 10
+    assert records[0]['Ast'] == 6
+    assert records[1]['Ast'] == None
+    assert records[0]['FgPct'] == 47.5
+
+
+def test_csv_stream_stores_body_unchanged(upstream, msf_v1, store_location):
+    upstream.respond(200, CSV_BODY)
+
+    records = list(msf_v1.msf_get_data(league='nba', season='2016-2017-regular', feed='cumulative_player_stats',
+                                       format='csv', stream=True, csv_types={'Player ID': int}))
+
+    assert records[0]['Player ID'] == 10
+    with open(store_location + 'cumulative_player_stats-nba-2016-2017-regular.csv', 'rb') as f:
+        assert f.read() == CSV_BODY
+
+
+def test_csv_lines_match_on_200_and_304(upstream, msf_v1):
+    kwargs = dict(league='nba', season='2016-2017-regular', feed='cumulative_player_stats', format='csv')
+
+    upstream.respond(200, CSV_BODY)
+    fetched = msf_v1.msf_get_data(**kwargs)
+
+    upstream.respond(304)
+    unchanged = msf_v1.msf_get_data(**kwargs)
+
+    assert fetched == unchanged
+    assert isinstance(fetched[0], str)
+
+
+def test_csv_fields_prune_stat_columns_only():
+    records = list(iter_csv_records(CSV_BODY.splitlines(), fields=['Pts']))
+
+    assert records[0] == {'Player ID': '10', 'LastName': 'Curry', 'Jersey Num': '30', 'Team Abbr.': 'GSW', 'Pts': 25}
@@ -0,0 +1,77 @@
+import pytest
+
+from ohmysportsfeedspy.odds import OddsHistory, LineSeries, _parse_time
+
+
+# A daily_game_lines snapshot with one moneyline per game, as {game id: (asOfTime, home line)}
+def game_lines(lines, last_updated='2020-10-11T12:00:00.000Z'):
+    return {
+        'lastUpdatedOn': last_updated,
+        'gameLines': [{
+            'game': {'id': game_id},
+            'lines': [{
+                'source': {'name': 'Book'},
+                'moneyLines': [{'asOfTime': as_of, 'moneyLine': {'gameSegment': 'FULL', 'homeLine': {'american': home}}}],
+            }],
+        } for game_id, (as_of, home) in lines.items()],
+    }
+
+
+FIELD = 'moneyLines.FULL.moneyLine.homeLine.american'
+
+
+def test_only_moves_are_kept_and_timed_by_their_line():
+    history = OddsHistory()
+
+    assert history.record(game_lines({1: ('2020-10-11T10:00:00.000Z', -110), 2: ('2020-10-11T10:30:00.000Z', 120)})) == 2
+    assert history.record(game_lines({1: ('2020-10-11T10:00:00.000Z', -110), 2: ('2020-10-11T11:00:00.000Z', 130)})) == 1
+
+    assert history.history(2) == {('Book', FIELD): [(_parse_time('2020-10-11T10:30:00'), 120), (_parse_time('2020-10-11T11:00:00'), 130)]}
+
+
+def test_moves_come_from_the_time_ordered_log():
+    history = OddsHistory()
+
+    history.record(game_lines({1: ('2020-10-11T10:00:00.000Z', -110), 2: ('2020-10-11T10:00:00.000Z', 120)}))
+    history.record(game_lines({1: ('2020-10-11T11:30:00.000Z', -120), 2: ('2020-10-11T11:00:00.000Z', 130)}))
+    history.record(game_lines({1: ('2020-10-11T13:00:00.000Z', -130)}))
+
+    start = _parse_time('2020-10-11T10:00:00')
+    end = _parse_time('2020-10-11T12:00:00')
+
+    assert history.moves(start, end) == [
+        (_parse_time('2020-10-11T11:00:00'), 2, 'Book', FIELD, 120, 130),
+        (_parse_time('2020-10-11T11:30:00'), 1, 'Book', FIELD, -110, -120),
+    ]
+
+
+def test_out_of_order_points_are_rejected():
+    series = LineSeries()
+    series.append(200, 1.0)
+
+    with pytest.raises(ValueError):
+        series.append(100, 2.0)
+
+    # Stale lines in a later snapshot are skipped
+    history = OddsHistory()
+    history.record(game_lines({1: ('2020-10-11T11:00:00.000Z', -110)}))
+
+    assert history.record(game_lines({1: ('2020-10-11T10:00:00.000Z', -150)})) == 0
+    assert history.history(1)[('Book', FIELD)] == [(_parse_time('2020-10-11T11:00:00'), -110)]
+
+
+def test_save_and_load(tmp_path):
+    history = OddsHistory()
+    history.record(game_lines({1: ('2020-10-11T10:00:00.000Z', -110), 2: ('2020-10-11T10:00:00.000Z', 120)}))
+    history.record(game_lines({1: ('2020-10-11T11:30:00.000Z', -120), 2: ('2020-10-11T11:00:00.000Z', 130)}))
+
+    path = str(tmp_path / 'lines.bin')
+    history.save(path)
+
+    loaded = OddsHistory.load(path)
+
+    assert loaded.history(1) == history.history(1)
+    assert loaded.moves(0, 2 ** 40) == history.moves(0, 2 ** 40)
+
+    loaded.record(game_lines({1: ('2020-10-11T12:00:00.000Z', -130)}))
+    assert len(loaded.moves(0, 2 ** 40)) == 3
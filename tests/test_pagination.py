@@ -0,0 +1,73 @@
+import pytest
+import requests
+
+from ohmysportsfeedspy.pagination import iter_pages, iter_paginated_records
+
+from tests.conftest import FakeResponse
+
+
+# Upstream holding 'total' players, answering offset/limit requests
+def players_handler(total):
+    def handler(url, params):
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', total))
+        players = [{'player': {'id': i}} for i in range(offset, min(offset + limit, total))]
+
+        return FakeResponse(200, {'players': players, 'references': {}})
+
+    return handler
+
+
+def player_ids(records):
+    return [record['player']['id'] for record in records]
+
+
+def test_paginate_fetches_every_record_without_requests_past_the_end(upstream, msf_v2):
+    upstream.handler = players_handler(250)
+
+    players = msf_v2.msf_get_data(league='nba', feed='players', format='json', paginate=True, page_size=100, workers=4)
+
+    assert player_ids(players) == list(range(250))
+    assert sorted(int(params['offset']) for url, params in upstream.calls) == [0, 100, 200]
+
+
+def test_paginate_honours_offset_and_limit(upstream, msf_v2):
+    upstream.handler = players_handler(250)
+
+    players = msf_v2.msf_get_data(league='nba', feed='players', format='json', paginate=True, page_size=100,
+                                  offset=50, limit=120)
+
+    assert player_ids(players) == list(range(50, 170))
+    assert sorted((int(params['offset']), int(params['limit'])) for url, params in upstream.calls) == [(50, 100), (150, 20)]
+
+
+def test_paginate_rejects_feeds_without_paging(upstream, msf_v1, msf_v2):
+    with pytest.raises(ValueError):
+        msf_v1.msf_get_data(league='nba', season='2016-2017-regular', feed='cumulative_player_stats', format='json', paginate=True)
+
+    with pytest.raises(ValueError):
+        msf_v2.msf_get_data(league='nba', season='2016-2017-regular', feed='game_boxscore', format='json', game='1', paginate=True)
+
+    assert upstream.calls == []
+
+
+def test_failed_pages_are_retried():
+    failures = {'count': 0}
+
+    def fetch_page(offset, limit):
+        if offset == 0 and failures['count'] < 2:
+            failures['count'] += 1
+            raise requests.ConnectionError("connection reset")
+
+        return {'players': list(range(offset, min(offset + limit, 15)))}
+
+    assert list(iter_paginated_records(fetch_page, 10, retry_delay=0)) == list(range(15))
+    assert failures['count'] == 2
+
+
+def test_retries_give_up_eventually():
+    def fetch_page(offset, limit):
+        raise Warning("Received unexpected status code 500")
+
+    with pytest.raises(Warning):
+        list(iter_pages(fetch_page, 10, retries=2, retry_delay=0))
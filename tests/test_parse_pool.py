@@ -0,0 +1,43 @@
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.test_pruning import V2_STATS
+
+
+def test_large_payloads_are_decoded_in_the_pool(upstream, msf_v2):
+    upstream.respond(200, V2_STATS)
+    msf_v2.set_parse_pool(workers=1, threshold=0)
+
+    try:
+        output = msf_v2.msf_get_data(league='nba', season='2016-2017-regular', feed='seasonal_player_stats', format='json',
+                                     stats='ast', fields=['ast'])
+    finally:
+        msf_v2.set_parse_pool(None)
+
+    assert output['playerStatsTotals'][0]['stats'] == {'offense': {'ast': 523}}
+
+
+def test_owned_pools_are_shut_down_when_replaced(msf_v2):
+    msf_v2.set_parse_pool(workers=1)
+    pool = msf_v2.api_instance.parse_executor
+
+    msf_v2.set_parse_pool(workers=1)
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "")
+
+    pool = msf_v2.api_instance.parse_executor
+
+    msf_v2.set_parse_pool(None)
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "")
+
+
+def test_given_executors_are_left_running(msf_v2):
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    msf_v2.set_parse_pool(executor)
+    msf_v2.set_parse_pool(None)
+
+    assert executor.submit(len, "abc").result() == 3
+    executor.shutdown()
@@ -0,0 +1,98 @@
+from ohmysportsfeedspy.planner import DataNeed, RequestPlanner
+
+from tests.conftest import FakeResponse
+
+
+def gamelog(game_id, start_time, player_id, slug):
+    first, last = slug.split('-')
+
+    return {
+        'game': {'id': game_id, 'startTime': start_time},
+        'player': {'id': player_id, 'firstName': first.title(), 'lastName': last.title()},
+        'team': {'id': 1, 'abbreviation': 'GSW'},
+        'stats': {'offense': {'pts': 30, 'ast': 5}},
+    }
+
+
+def test_daily_requests_keep_games_starting_after_midnight_eastern(upstream, msf_v2):
+    # A game listed on January 15th that starts at 00:30 ET on the 16th
+    upstream.respond(200, {'gamelogs': [gamelog(1, '2017-01-16T05:30:00.000Z', 9218, 'stephen-curry')]})
+
+    planner = RequestPlanner(msf_v2)
+    need = DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170115')
+
+    planned = planner.plan([need])
+    assert [request.feed for request in planned] == ['daily_player_gamelogs']
+
+    results = planner.execute([need], planned)
+    assert [entry['game']['id'] for entry in results[0]['gamelogs']] == [1]
+
+
+def test_stored_player_requests_are_not_shared(upstream, msf_v2):
+    def handler(url, params):
+        slug = params['player']
+        return FakeResponse(200, {'gamelogs': [gamelog(len(slug), '2017-01-15T20:00:00.000Z', len(slug), slug)]})
+
+    upstream.handler = handler
+    planner = RequestPlanner(msf_v2, max_age=3600)
+
+    curry = DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170115', players=['stephen-curry'])
+    lebron = DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170115', players=['lebron-james'])
+
+    assert planner.execute([curry])[0]['gamelogs'][0]['player']['lastName'] == 'Curry'
+    assert planner.execute([lebron])[0]['gamelogs'][0]['player']['lastName'] == 'James'
+    assert len(upstream.calls) == 2
+
+
+def test_merged_ranges_are_split_per_need(upstream, msf_v2):
+    upstream.respond(200, {'gamelogs': [
+        gamelog(1, '2017-01-10T20:00:00.000Z', 9218, 'stephen-curry'),
+        gamelog(2, '2017-01-11T20:00:00.000Z', 9218, 'stephen-curry'),
+        gamelog(3, '2017-01-12T20:00:00.000Z', 9218, 'stephen-curry'),
+    ]})
+
+    planner = RequestPlanner(msf_v2)
+    needs = [
+        DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170110', '20170111', fields=['pts']),
+        DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170111', '20170112'),
+    ]
+
+    planned = planner.plan(needs)
+    assert len(planned) == 1
+    assert planned[0].params['date'] == 'from-20170110-to-20170112'
+
+    results = planner.execute(needs, planned)
+
+    assert [entry['game']['id'] for entry in results[0]['gamelogs']] == [1, 2]
+    assert results[0]['gamelogs'][0]['stats'] == {'offense': {'pts': 30}}
+    assert [entry['game']['id'] for entry in results[1]['gamelogs']] == [2, 3]
+
+
+def test_fields_match_as_in_get_data(upstream, msf_v2):
+    upstream.respond(200, {'gamelogs': [gamelog(1, '2017-01-10T20:00:00.000Z', 9218, 'stephen-curry')]})
+
+    planner = RequestPlanner(msf_v2)
+    needs = [
+        DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170110', fields=['PTS']),
+        DataNeed('nba', '2016-2017-regular', 'player_gamelogs', '20170110', fields=['AST']),
+    ]
+
+    results = planner.execute(needs)
+
+    assert results[0]['gamelogs'][0]['stats'] == {'offense': {'pts': 30}}
+    assert results[1]['gamelogs'][0]['stats'] == {'offense': {'ast': 5}}
+
+
+def test_needs_matching_the_stats_filter_are_used_as_returned(upstream, msf_v2):
+    # The filter takes abbreviations, which differ from the response's stat names
+    entry = gamelog(1, '2017-01-10T20:00:00.000Z', 10300, 'jose-altuve')
+    entry['stats'] = {'batting': {'atBats': 4, 'hits': 2}}
+    upstream.respond(200, {'gamelogs': [entry]})
+
+    planner = RequestPlanner(msf_v2)
+    need = DataNeed('mlb', '2017-regular', 'player_gamelogs', '20170110', fields=['AB', 'H'])
+
+    results = planner.execute([need])
+
+    assert upstream.calls[0][1]['stats'] == 'AB,H'
+    assert results[0]['gamelogs'][0]['stats'] == {'batting': {'atBats': 4, 'hits': 2}}
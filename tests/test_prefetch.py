@@ -0,0 +1,58 @@
+import datetime
+
+from ohmysportsfeedspy.prefetch import Prefetcher
+
+from tests.conftest import FakeResponse
+
+
+def test_max_age_keeps_filtered_requests_apart(upstream, msf_v2):
+    upstream.handler = lambda url, params: FakeResponse(200, {'player': params['player']})
+    kwargs = dict(league='nba', season='2016-2017-regular', feed='seasonal_player_gamelogs', format='json', max_age=3600)
+
+    assert msf_v2.msf_get_data(player='stephen-curry', **kwargs) == {'player': 'stephen-curry'}
+    assert msf_v2.msf_get_data(player='lebron-james', **kwargs) == {'player': 'lebron-james'}
+    assert len(upstream.calls) == 2
+
+    # Each filtered response is now served from its own stored copy
+    assert msf_v2.msf_get_data(player='stephen-curry', **kwargs) == {'player': 'stephen-curry'}
+    assert len(upstream.calls) == 2
+
+
+def test_stored_filenames_cover_every_param(msf_v2):
+    api = msf_v2.api_instance
+    make_filename = api._API_v1_0__make_output_filename
+
+    base = make_filename('nba', 'current', 'seasonal_player_gamelogs', 'json', {'date': '20170115', 'force': 'false'})
+    assert base == 'seasonal_player_gamelogs-nba-current-20170115.json'
+
+    names = set([base])
+    for params in [{'team': 'bos'}, {'position': 'C'}, {'status': 'final'}, {'sort': 'stats.pts.d'},
+                   {'limit': '10'}, {'limit': '10', 'offset': '10'}]:
+        params['date'] = '20170115'
+        names.add(make_filename('nba', 'current', 'seasonal_player_gamelogs', 'json', params))
+
+    assert len(names) == 7
+
+    # Param order doesn't matter
+    assert make_filename('nba', 'current', 'seasonal_player_gamelogs', 'json', {'team': 'bos', 'player': 'x'}) == \
+        make_filename('nba', 'current', 'seasonal_player_gamelogs', 'json', {'player': 'x', 'team': 'bos'})
+
+
+def test_warm_fetches_upcoming_games_within_budget(upstream, msf_v2):
+    def handler(url, params):
+        if url.endswith('/games.json'):
+            return FakeResponse(200, {'games': [
+                {'schedule': {'id': 1, 'startTime': '2017-01-15T20:00:00.000Z'}},
+                {'schedule': {'id': 2, 'startTime': '2017-01-20T20:00:00.000Z'}},
+            ]})
+        return FakeResponse(200, {})
+
+    upstream.handler = handler
+    prefetcher = Prefetcher(msf_v2, 'nba', '2016-2017-regular', budget=4, game_feeds=['game_boxscore'])
+
+    fetched = prefetcher.warm(today=datetime.date(2017, 1, 15))
+    assert fetched == [('player_injuries', {}), ('daily_games', {'date': '20170115'}), ('daily_dfs', {'date': '20170115'})]
+
+    # The schedule request counts towards the budget; fresh requests are skipped on the next run
+    fetched = prefetcher.warm(today=datetime.date(2017, 1, 15))
+    assert fetched == [('daily_game_lines', {'date': '20170115'}), ('game_boxscore', {'game': '1'})]
@@ -0,0 +1,81 @@
+import io
+import json
+
+from ohmysportsfeedspy.parsers import load_json, iter_xml_records
+
+from tests.test_xml import XML_BODY
+
+
+V1_STATS = {
+    'cumulativeplayerstats': {
+        'playerstatsentry': [{
+            'player': {'ID': '9218', 'LastName': 'Curry'},
+            'stats': {
+                'GamesPlayed': {'@abbreviation': 'GP', '#text': '79'},
+                'Pts': {'@category': 'Offense', '@abbreviation': 'PTS', '#text': '1999'},
+                'Ast': {'@category': 'Offense', '@abbreviation': 'AST', '#text': '523'},
+            },
+        }],
+    },
+}
+
+V2_STATS = {
+    'playerStatsTotals': [{
+        'player': {'id': 9218},
+        'stats': {'offense': {'pts': 1999, 'ast': 523}, 'defense': {'stl': 141}},
+    }],
+}
+
+
+V2_BASEBALL_STATS = {
+    'playerStatsTotals': [{
+        'player': {'id': 10300},
+        'stats': {'batting': {'atBats': 612, 'hits': 189}},
+    }],
+}
+
+
+def test_pushed_down_fields_are_not_pruned_again(upstream, msf_v2):
+    # The stats filter takes abbreviations, which differ from the response's stat names
+    upstream.respond(200, V2_BASEBALL_STATS)
+
+    output = msf_v2.msf_get_data(league='mlb', season='2017-regular', feed='seasonal_player_stats', format='json',
+                                 fields=['AB', 'H'])
+
+    url, params = upstream.calls[0]
+    assert params['stats'] == 'AB,H'
+    assert output == V2_BASEBALL_STATS
+
+
+def test_v1_fields_match_stat_abbreviations(upstream, msf_v1):
+    upstream.respond(200, V1_STATS)
+
+    # The filter is set explicitly, so the fields are applied while decoding
+    output = msf_v1.msf_get_data(league='nba', season='2016-2017-regular', feed='cumulative_player_stats', format='json',
+                                 playerstats='PTS,AST', fields=['PTS'])
+
+    url, params = upstream.calls[0]
+    assert params['playerstats'] == 'PTS,AST'
+
+    entry = output['cumulativeplayerstats']['playerstatsentry'][0]
+    assert entry['player'] == {'ID': '9218', 'LastName': 'Curry'}
+    assert entry['stats'] == {'Pts': {'@category': 'Offense', '@abbreviation': 'PTS', '#text': '1999'}}
+
+
+def test_v2_fields_prune_stats_while_decoding():
+    data = load_json(json.dumps(V2_STATS), ['pts', 'stl'])
+
+    assert data['playerStatsTotals'][0]['stats'] == {'offense': {'pts': 1999}, 'defense': {'stl': 141}}
+
+
+def test_fields_are_case_insensitive():
+    data = load_json(b'{"stats": {"offense": {"pts": 1, "ast": 2}}}', ['PTS'])
+
+    assert data == {'stats': {'offense': {'pts': 1}}}
+
+
+def test_xml_fields_match_stat_abbreviations():
+    records = list(iter_xml_records(io.BytesIO(XML_BODY), 'gamelog', ['AST']))
+
+    assert records[0]['stats'] == {'Ast': {'@abbreviation': 'AST', '#text': 5}}
+    assert records[0]['game'] == {'id': 1}
@@ -0,0 +1,80 @@
+import os
+import pytest
+
+from ohmysportsfeedspy import MySportsFeeds
+from ohmysportsfeedspy.results import BoundedResults
+
+from tests.conftest import FakeResponse
+
+
+def daily_games(url, params):
+    return FakeResponse(200, {'date': params['date'], 'games': [{'schedule': {'id': i}} for i in range(20)]})
+
+
+def fetch_days(results, days):
+    for day in days:
+        date = '201701{:02d}'.format(day)
+        results.fetch(date, league='nba', season='2016-2017-regular', feed='daily_games', format='json', date=date)
+
+
+def test_results_over_budget_are_spilled_and_reloaded(upstream, msf_v2):
+    upstream.handler = daily_games
+    results = BoundedResults(msf_v2, budget_bytes=1500, expansion=1)
+
+    fetch_days(results, range(1, 6))
+
+    assert len(results) == 5
+    assert 0 < results.loaded_count() < 5
+    assert results.used_bytes <= 1500
+
+    # Spilled results come back from the store without another request
+    assert [data['date'] for key, data in results.items()] == ['20170101', '20170102', '20170103', '20170104', '20170105']
+    assert len(upstream.calls) == 5
+
+
+def test_newest_result_is_kept_even_over_budget(upstream, msf_v2):
+    upstream.handler = daily_games
+    results = BoundedResults(msf_v2, budget_bytes=1)
+
+    fetch_days(results, [1, 2])
+
+    assert results.loaded_count() == 1
+    assert '20170101' in results
+
+    del results['20170101']
+    assert results.keys() == ['20170102']
+
+
+def test_a_store_is_required():
+    msf = MySportsFeeds('2.1', store_type=None)
+
+    with pytest.raises(ValueError):
+        BoundedResults(msf)
+
+
+def test_spilled_results_survive_later_fetches_of_the_same_request(upstream, msf_v2):
+    kwargs = dict(league='nba', season='2016-2017-regular', feed='daily_games', format='json', date='20170101')
+    results = BoundedResults(msf_v2, budget_bytes=1)
+
+    upstream.respond(200, {'games': [{'schedule': {'id': 1}}]})
+    results.fetch('a', **kwargs)
+    fetch_days(results, [2])
+
+    # The shared stored file is overwritten by a newer response
+    upstream.respond(200, {'games': [{'schedule': {'id': 2}}]})
+    msf_v2.msf_get_data(**kwargs)
+
+    assert results.loaded_count() == 1
+    assert results['a'] == {'games': [{'schedule': {'id': 1}}]}
+
+
+def test_payload_copies_are_removed_with_their_result(upstream, msf_v2, store_location):
+    upstream.handler = daily_games
+    results = BoundedResults(msf_v2)
+
+    fetch_days(results, [1])
+    fetch_days(results, [1])
+    assert len([name for name in os.listdir(store_location) if name.startswith('bounded-')]) == 1
+
+    del results['20170101']
+    assert [name for name in os.listdir(store_location) if name.startswith('bounded-')] == []
@@ -0,0 +1,101 @@
+import os
+import time
+import multiprocessing
+
+from ohmysportsfeedspy.store import FileStore
+
+
+def _write_repeatedly(location):
+    store = FileStore(location)
+
+    for i in range(50):
+        store.write('shared.json', [b'{"value": ', str(i).encode('ascii') * 1000, b'}'])
+
+        with open(store.path('shared.json'), 'rb') as f:
+            content = f.read()
+        assert content.startswith(b'{"value": ') and content.endswith(b'}')
+
+
+def test_write_is_atomic_and_leaves_no_temp_files(tmp_path):
+    store = FileStore(str(tmp_path))
+
+    assert store.write('feed.json', [b'{"a":', b' 1}']) == 8
+    assert store.exists('feed.json')
+    assert os.listdir(str(tmp_path)) == ['feed.json']
+
+
+def test_concurrent_writers_never_expose_partial_files(tmp_path):
+    processes = [multiprocessing.Process(target=_write_repeatedly, args=(str(tmp_path),)) for i in range(4)]
+
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert os.listdir(str(tmp_path)) == ['shared.json']
+
+
+def test_metadata_comes_from_the_file(tmp_path):
+    store = FileStore(str(tmp_path))
+
+    assert store.get_metadata('feed.json') == None
+
+    store.write('feed.json', [b'{}'])
+    os.utime(store.path('feed.json'), (0, 0))
+    assert store.get_metadata('feed.json') == {'fetched': 0, 'size': 2}
+
+    store.touch('feed.json')
+    assert time.time() - store.get_metadata('feed.json')['fetched'] < 60
+
+
+def test_unchanged_response_refreshes_stored_age(upstream, msf_v2):
+    kwargs = dict(league='nba', season='2016-2017-regular', feed='seasonal_games', format='json')
+
+    upstream.respond(200, {'games': []})
+    msf_v2.msf_get_data(**kwargs)
+
+    path = msf_v2.api_instance.stored_path(**kwargs)
+    os.utime(path, (0, 0))
+    assert msf_v2.api_instance.stored_age(**kwargs) > 3600
+
+    upstream.respond(304)
+    assert msf_v2.msf_get_data(**kwargs) == {'games': []}
+    assert msf_v2.api_instance.stored_age(**kwargs) < 60
+
+
+def test_stored_files_get_the_default_mode(tmp_path):
+    mask = os.umask(0o022)
+
+    try:
+        store = FileStore(str(tmp_path))
+    finally:
+        os.umask(mask)
+
+    store.write('feed.json', [b'{}'])
+
+    assert os.stat(store.path('feed.json')).st_mode & 0o777 == 0o644
+
+
+def test_snapshots_keep_the_original_content(tmp_path, monkeypatch):
+    store = FileStore(str(tmp_path))
+    store.write('feed.json', [b'{"a": 1}'])
+
+    store.snapshot('feed.json', 'copy.json')
+
+    # Without hard links, the file is copied instead
+    def link(source, target):
+        raise OSError("links not supported")
+
+    monkeypatch.setattr(os, 'link', link)
+    store.snapshot('feed.json', 'other.json')
+
+    store.write('feed.json', [b'{"a": 2}'])
+
+    for name in ['copy.json', 'other.json']:
+        with open(store.path(name), 'rb') as f:
+            assert f.read() == b'{"a": 1}'
+
+    store.remove('copy.json')
+    store.remove('copy.json')
+    assert not store.exists('copy.json')
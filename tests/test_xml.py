@@ -0,0 +1,62 @@
+import io
+import pytest
+
+from ohmysportsfeedspy.parsers import iter_xml_elements, iter_xml_records
+
+
+XML_BODY = (b'<?xml version="1.0"?>'
+            b'<pgl:playergamelogs xmlns:pgl="http://www.mysportsfeeds.com">'
+            b'<pgl:lastUpdatedOn>2017-01-01</pgl:lastUpdatedOn>'
+            b'<pgl:gamelogs>'
+            b'<pgl:gamelog><pgl:game><pgl:id>1</pgl:id></pgl:game>'
+            b'<pgl:stats><pgl:Pts abbreviation="PTS">30</pgl:Pts><pgl:Ast abbreviation="AST">5</pgl:Ast></pgl:stats></pgl:gamelog>'
+            b'<pgl:gamelog><pgl:game><pgl:id>2</pgl:id></pgl:game></pgl:gamelog>'
+            b'</pgl:gamelogs>'
+            b'</pgl:playergamelogs>')
+
+
+def test_xml_records_by_tag():
+    records = list(iter_xml_records(io.BytesIO(XML_BODY), 'gamelog'))
+
+    assert len(records) == 2
+    assert records[0]['game'] == {'id': 1}
+    assert records[0]['stats']['Pts']['#text'] == 30
+
+
+def test_xml_consumed_records_are_released():
+    previous = None
+
+    for element in iter_xml_elements(io.BytesIO(XML_BODY), 'gamelog'):
+        if previous != None:
+            assert len(previous) == 0
+        previous = element
+
+
+def test_xml_stream_requires_record_tag(upstream, msf_v1):
+    upstream.respond(200, XML_BODY)
+
+    with pytest.raises(ValueError):
+        msf_v1.msf_get_data(league='nba', season='2016-2017-regular', feed='player_gamelogs', format='xml', stream=True)
+
+    assert upstream.calls == []
+
+
+def test_xml_stream_stores_body_unchanged(upstream, msf_v1, store_location):
+    upstream.respond(200, XML_BODY)
+
+    records = list(msf_v1.msf_get_data(league='nba', season='2016-2017-regular', feed='player_gamelogs',
+                                       format='xml', stream=True, record_tag='gamelog'))
+
+    assert [record['game']['id'] for record in records] == [1, 2]
+    with open(store_location + 'player_gamelogs-nba-2016-2017-regular.xml', 'rb') as f:
+        assert f.read() == XML_BODY
+
+
+def test_xml_text_on_200_and_304(upstream, msf_v1):
+    kwargs = dict(league='nba', season='2016-2017-regular', feed='player_gamelogs', format='xml')
+
+    upstream.respond(200, XML_BODY)
+    assert msf_v1.msf_get_data(**kwargs) == XML_BODY.decode('utf-8')
+
+    upstream.respond(304)
+    assert msf_v1.msf_get_data(**kwargs) == XML_BODY.decode('utf-8')